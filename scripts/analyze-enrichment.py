@@ -6,111 +6,214 @@ Extracts entries, identifies unenriched ones, and creates batch manifests.
 Usage: analyze-enrichment.py file.bib
 """
 
+import hashlib
 import json
+import mmap
+import os
+import re
+import sqlite3
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
+
+_ENTRY_LINE_RE = re.compile(rb"^@", re.MULTILINE)
+_ENTRY_KEY_RE = re.compile(rb"@\w+\{([^,\s]+)")
+_ENTRY_FILE_RE = re.compile(r"entry-([1-9]\d*)\.bib")
+
+# Digest of the .bib file the current tmp/<base>/ extraction was made from,
+# plus the size and mtime of every file it wrote
+EXTRACT_MANIFEST_FILENAME = ".extract-manifest.json"
+
+# Same index as init-tracking-db.py; older databases get it on first use
+_SQL_CREATE_LOOKUP_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_latest_status_lookup
+    ON enrichment_log(file_path, entry_key, timestamp, status)
+"""
+
+# Equivalent to latest_enrichment_status, but answered from the index above
+_SQL_ENRICHED_KEYS = """
+    SELECT entry_key FROM (
+        SELECT entry_key, status, MAX(timestamp)
+        FROM enrichment_log
+        WHERE file_path = ?
+        GROUP BY entry_key
+    )
+    WHERE status = 'success'
+"""
 
 
 def count_entries(filepath: str | Path) -> int:
-    """Count total entries in BibTeX file."""
+    """Count total entries in BibTeX file (lines starting with '@')."""
     try:
-        result = subprocess.run(
-            ["grep", "-c", "^@", str(filepath)], capture_output=True, text=True
-        )
-        return int(result.stdout.strip())
-    except (subprocess.SubprocessError, ValueError):
+        with open(filepath, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return sum(1 for _ in _ENTRY_LINE_RE.finditer(mm))
+    except (OSError, ValueError):
+        # ValueError: mmap cannot map an empty file
         return 0
 
 
-def count_enriched(filepath: str | Path) -> int:
-    """Count entries that have been successfully enriched according to the database."""
-    import sqlite3
+def _configure(conn: sqlite3.Connection) -> None:
+    """Apply read-friendly pragmas; WAL lets this run alongside enrichment writers."""
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA temp_store=MEMORY")
 
-    db_path = "bibliography.db"
-    if not Path(db_path).exists():
-        return 0  # No database means nothing has been enriched
 
+def load_enriched_keys(filepath: str | Path) -> frozenset[str]:
+    """Load keys of entries successfully enriched according to the database."""
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT COUNT(DISTINCT entry_key) 
-            FROM latest_enrichment_status 
-            WHERE file_path = ? AND latest_status = 'success'
-        """,
-            (str(filepath),),
-        )
-        result = cursor.fetchone()
-        conn.close()
-        return result[0] if result else 0
+        # mode=rw fails fast instead of creating an empty database file
+        conn = sqlite3.connect("file:bibliography.db?mode=rw", uri=True)
+    except sqlite3.OperationalError:
+        return frozenset()  # No database means nothing has been enriched
+
+    try:
+        _configure(conn)
+        # Index check and lookup share one transaction instead of one each
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute(_SQL_CREATE_LOOKUP_INDEX)
+            cursor = conn.cursor()
+            cursor.arraysize = 10_000
+            cursor.execute(_SQL_ENRICHED_KEYS, (os.fspath(filepath),))
+            # Iterate the cursor directly; fetchall() would build a throwaway list
+            return frozenset(row[0] for row in cursor)
     except Exception:
-        return 0
+        return frozenset()  # If database query fails, assume nothing is enriched
+    finally:
+        conn.close()
+
+
+def count_enriched(filepath: str | Path) -> int:
+    """Count entries that have been successfully enriched according to the database."""
+    return len(load_enriched_keys(filepath))
 
 
 def extract_entries(filepath: str | Path) -> tuple[bool, str]:
-    """Extract all entries using existing script."""
+    """Extract all entries using existing script.
+
+    Only the extractor's stderr is kept (for error reporting); its stdout
+    summary is never consumed, so it is discarded rather than buffered.
+    """
     try:
         script_path = Path(__file__).parent / "extract-entries.py"
         result = subprocess.run(
-            ["python3", str(script_path), str(filepath)], capture_output=True, text=True
+            ["python3", str(script_path), str(filepath)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
         )
         if result.returncode != 0:
             return False, result.stderr
-        return True, result.stdout
+        return True, ""
     except Exception as e:
         return False, str(e)
 
 
-def find_unenriched_entries(
-    base_dir: Path, total_count: int, filepath: str | Path
-) -> list[dict[str, str | int]]:
-    """Find entries not successfully enriched according to the database."""
-    import re
-    import sqlite3
+def file_sha256(filepath: str | Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest.update(mm)
+        except ValueError:
+            pass  # mmap cannot map an empty file
+    return digest.hexdigest()
+
+
+def snapshot_extraction(tmp_dir: Path) -> dict[str, list[int]]:
+    """Map index.json and each entry-N.bib in tmp_dir to [size, mtime_ns]."""
+    snapshot: dict[str, list[int]] = {}
+    with os.scandir(tmp_dir) as it:
+        for entry in it:
+            if entry.name == "index.json" or _ENTRY_FILE_RE.fullmatch(entry.name):
+                stat = entry.stat()
+                snapshot[entry.name] = [stat.st_size, stat.st_mtime_ns]
+    return snapshot
+
+
+def extract_entries_cached(filepath: str | Path, tmp_dir: Path) -> tuple[bool, str]:
+    """Extract entries unless tmp_dir holds an unmodified extraction of this content.
+
+    Entry files are edited during enrichment, so an extraction is only reused
+    while every file it wrote still has the size and mtime recorded with it.
+    """
+    digest = file_sha256(filepath)
+    manifest_file = tmp_dir / EXTRACT_MANIFEST_FILENAME
+    try:
+        manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+        files = manifest["files"]
+        if (
+            manifest["source_sha256"] == digest
+            and "index.json" in files
+            and files == snapshot_extraction(tmp_dir)
+        ):
+            return True, ""
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
 
-    db_path = "bibliography.db"
-    enriched_keys: set[str] = set()
+    success, output = extract_entries(filepath)
+    if success:
+        manifest = {"source_sha256": digest, "files": snapshot_extraction(tmp_dir)}
+        manifest_file.write_text(json.dumps(manifest), encoding="utf-8")
+    return success, output
 
-    # Get successfully enriched entries from database
-    if Path(db_path).exists():
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT DISTINCT entry_key 
-                FROM latest_enrichment_status 
-                WHERE file_path = ? AND latest_status = 'success'
-            """,
-                (str(filepath),),
-            )
-            enriched_keys = {row[0] for row in cursor.fetchall()}
-            conn.close()
-        except Exception:
-            pass  # If database query fails, assume nothing is enriched
 
-    unenriched: list[dict[str, str | int]] = []
+def read_entry_key(entry_file: str | Path) -> str | None:
+    """Extract the entry key from an extracted entry-N.bib file."""
+    with open(entry_file, "rb") as f:
+        content = f.read()
 
-    for i in range(1, total_count + 1):
-        entry_file = base_dir / f"entry-{i}.bib"
-        if entry_file.exists():
-            with open(entry_file, "r", encoding="utf-8") as f:
-                content = f.read()
+    match = _ENTRY_KEY_RE.match(content.lstrip())
+    return match.group(1).decode("utf-8") if match else None
 
-            # Extract entry key from the file
-            match = re.match(r"@\w+\{([^,\s]+)", content.strip())
-            if match:
-                entry_key = match.group(1)
-                # Check if this entry is NOT in the enriched set
-                if entry_key not in enriched_keys:
-                    unenriched.append({"index": i, "file": str(entry_file)})
-            else:
-                # If we can't extract a key, assume it needs enrichment
-                unenriched.append({"index": i, "file": str(entry_file)})
 
-    return unenriched
+def find_unenriched_entries(
+    base_dir: Path, total_count: int, enriched_keys: frozenset[str]
+) -> list[dict[str, str | int]]:
+    """Find extracted entries whose keys are not in the enriched set."""
+    # extract-entries.py records each entry's key in index.json; older
+    # extractions without the sidecar fall back to reading every entry file.
+    # A missing key means it could not be parsed: assume it needs enrichment.
+    base_dir_s = os.fspath(base_dir)
+    index_file = f"{base_dir_s}/index.json"
+    if os.path.exists(index_file):
+        with open(index_file, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        return [
+            {"index": int(i), "file": f"{base_dir_s}/entry-{i}.bib"}
+            for i, entry_key in index.items()
+            if int(i) <= total_count
+            and (entry_key is None or entry_key not in enriched_keys)
+        ]
+
+    # One directory read instead of an exists() check per possible entry
+    try:
+        with os.scandir(base_dir_s) as it:
+            numbered = [
+                (int(m.group(1)), item.path)
+                for item in it
+                if (m := _ENTRY_FILE_RE.fullmatch(item.name))
+            ]
+    except OSError:
+        return []
+    entry_files = sorted((i, entry_file) for i, entry_file in numbered if i <= total_count)
+
+    # Entry files are independent small reads, so overlap them
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        entry_keys = executor.map(read_entry_key, [f for _, f in entry_files])
+        return [
+            {"index": i, "file": entry_file}
+            for (i, entry_file), entry_key in zip(entry_files, entry_keys)
+            if entry_key is None or entry_key not in enriched_keys
+        ]
 
 
 def create_batches(
@@ -124,6 +227,11 @@ def create_batches(
     return batches
 
 
+def write_batch_file(batch_file: Path, payload: dict[str, object]) -> None:
+    """Write one batch manifest (compact JSON; these are machine-consumed)."""
+    batch_file.write_bytes(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
 def init_database_if_needed(db_path: str = "bibliography.db") -> None:
     """Initialize database if it doesn't exist."""
     if not Path(db_path).exists():
@@ -144,29 +252,21 @@ def init_database_if_needed(db_path: str = "bibliography.db") -> None:
             sys.exit(1)
 
 
-def main() -> None:
-    if len(sys.argv) != 2:
-        print("Usage: analyze-enrichment.py file.bib", file=sys.stderr)
-        sys.exit(1)
-
-    # Ensure database exists before proceeding
-    init_database_if_needed()
-
-    filepath = Path(sys.argv[1])
-
+def analyze(filepath: Path) -> tuple[dict[str, Any], int]:
+    """Analyze filepath and prepare batches; returns (result, exit code)."""
     if not filepath.exists():
         result = {
             "status": "error",
             "message": f"File '{filepath}' not found",
             "action_required": "check_file",
         }
-        print(json.dumps(result, indent=2))
-        sys.exit(1)
+        return result, 1
 
     try:
         # Count entries
         total = count_entries(filepath)
-        enriched = count_enriched(filepath)
+        enriched_keys = load_enriched_keys(filepath)
+        enriched = len(enriched_keys)
         remaining = total - enriched
 
         if remaining == 0:
@@ -178,24 +278,22 @@ def main() -> None:
                 "unenriched_entries": 0,
                 "action_required": "none",
             }
-            print(json.dumps(result, indent=2))
-            return
+            return result, 0
 
-        # Extract all entries
-        success, output = extract_entries(filepath)
+        # Extract all entries (skipped when the file is unchanged since last time)
+        base_name = filepath.stem
+        tmp_dir = Path("tmp") / base_name
+        success, output = extract_entries_cached(filepath, tmp_dir)
         if not success:
             result = {
                 "status": "error",
                 "message": f"Failed to extract entries: {output}",
                 "action_required": "debug",
             }
-            print(json.dumps(result, indent=2))
-            sys.exit(1)
+            return result, 1
 
         # Find unenriched entries
-        base_name = filepath.stem
-        tmp_dir = Path("tmp") / base_name
-        unenriched = find_unenriched_entries(tmp_dir, total, filepath)
+        unenriched = find_unenriched_entries(tmp_dir, total, enriched_keys)
 
         # Create batches
         batches = create_batches(unenriched)
@@ -203,17 +301,18 @@ def main() -> None:
         # Save batch information
         batch_dir = tmp_dir / "batches"
         batch_dir.mkdir(exist_ok=True)
-
-        batch_files: list[str] = []
-        for i, batch in enumerate(batches, 1):
-            batch_file = batch_dir / f"batch-{i}.json"
-            with open(batch_file, "w", encoding="utf-8") as f:
-                json.dump(
-                    {"batch_number": i, "entries": batch, "count": len(batch)},
-                    f,
-                    indent=2,
-                )
-            batch_files.append(str(batch_file))
+        # A reused extraction may still hold manifests from an earlier run
+        for stale in batch_dir.glob("batch-*.json"):
+            stale.unlink()
+
+        batch_paths = [batch_dir / f"batch-{i}.json" for i in range(1, len(batches) + 1)]
+        payloads = [
+            {"batch_number": i, "entries": batch, "count": len(batch)}
+            for i, batch in enumerate(batches, 1)
+        ]
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(write_batch_file, batch_paths, payloads))
+        batch_files = [str(batch_file) for batch_file in batch_paths]
 
         # Success output
         result = {
@@ -237,13 +336,26 @@ def main() -> None:
                 f"done > {filepath}.enriched"
             ),
         }
-        print(json.dumps(result, indent=2))
+        return result, 0
 
     except Exception as e:
         result = {"status": "error", "message": str(e), "action_required": "debug"}
-        print(json.dumps(result, indent=2))
+        return result, 1
+
+
+def main() -> None:
+    if len(sys.argv) != 2:
+        print("Usage: analyze-enrichment.py file.bib", file=sys.stderr)
         sys.exit(1)
 
+    # Ensure database exists before proceeding
+    init_database_if_needed()
+
+    result, code = analyze(Path(sys.argv[1]))
+    print(json.dumps(result, indent=2))
+    if code:
+        sys.exit(code)
+
 
 if __name__ == "__main__":
     main()
@@ -4,7 +4,7 @@ Batch enrichment script that processes multiple entries and tracks each result.
 
 This script:
 1. Reads a batch JSON file with entries to enrich
-2. For each entry, calls enrich-single-entry.py
+2. Feeds the entries to a small pool of long-lived enrich-single-entry.py workers
 3. Collects results and provides summary
 4. All tracking is handled automatically by the single-entry script
 
@@ -18,13 +18,113 @@ The batch JSON file should have the format:
 """
 
 import json
+import queue
 import subprocess
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
+# Each enrichment is an independent, I/O-bound child process.
+MAX_WORKERS = 8
 
-def process_batch(batch_file: str) -> dict[str, int]:
-    """Process a batch of entries for enrichment."""
+# Marker printed by enrich-single-entry.py after each entry it processes.
+STATUS_PREFIX = "ENTRY_STATUS:"
+
+# Printed by enrich-single-entry.py when an entry's result was not tracked.
+TRACKING_FAILED_PREFIX = "TRACKING_FAILED:"
+
+# (exit code, or None if the worker died before reporting one; output lines)
+EntryResult = tuple[int | None, list[str]]
+
+
+def start_worker(source_file: str) -> subprocess.Popen[str]:
+    """Start an enrichment worker that reads entry keys from stdin."""
+    cmd = [sys.executable, "scripts/enrich-single-entry.py", source_file, "--stdin"]
+    return subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    )
+
+
+def read_entry_result(worker: subprocess.Popen[str]) -> tuple[int | None, list[str]]:
+    """Read one entry's output up to its status line (None if the worker died)."""
+    lines: list[str] = []
+    for line in worker.stdout:
+        line = line.rstrip("\n")
+        if line.startswith(STATUS_PREFIX):
+            return int(line.rpartition(" ")[2]), lines
+        lines.append(line)
+    return None, lines
+
+
+def stop_worker(worker: subprocess.Popen[str], worst: int) -> list[str]:
+    """Close a worker's input and wait for it; return problems it reported.
+
+    A worker exits with the worst code of the entries it processed, so any
+    other exit status, or output after the last status line, means part of
+    its work (such as tracking) failed after its entries were reported.
+    """
+    worker.stdin.close()
+    trailing = [line.rstrip("\n") for line in worker.stdout]
+    returncode = worker.wait()
+    if returncode == worst and not trailing:
+        return []
+    return [f"Worker exited with status {returncode}", *trailing]
+
+
+def run_worker(
+    source_file: str, pending: "queue.SimpleQueue[tuple[str, Future[EntryResult]]]"
+) -> list[str]:
+    """Feed queued entries to one worker process until the queue is empty.
+
+    Returns the problems reported by the worker after its last entry.
+    """
+    worker = None
+    worst = 0
+    try:
+        while True:
+            try:
+                entry_key, future = pending.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                if worker is None:
+                    worker = start_worker(source_file)
+                    worst = 0
+                worker.stdin.write(f"{entry_key}\n")
+                worker.stdin.flush()
+                returncode, lines = read_entry_result(worker)
+                if returncode is None:
+                    # Worker crashed mid-entry; the next entry gets a fresh one
+                    worker.wait()
+                    worker = None
+                elif returncode == 1 or worst == 0:
+                    worst = returncode
+                future.set_result((returncode, lines))
+            except Exception as e:
+                if worker is not None:
+                    worker.kill()
+                    worker.wait()
+                    worker = None
+                future.set_exception(e)
+    except BaseException:
+        if worker is not None:
+            worker.kill()
+            worker.wait()
+        raise
+
+    if worker is None:
+        return []
+    return stop_worker(worker, worst)
+
+
+def process_batch(batch_file: str) -> tuple[dict[str, int], bool]:
+    """Process a batch of entries; also return whether every result was tracked."""
     try:
         with open(batch_file, "r", encoding="utf-8") as f:
             batch_data = json.load(f)
@@ -41,46 +141,78 @@ def process_batch(batch_file: str) -> dict[str, int]:
 
     if not entries:
         print("Warning: No entries to process")
-        return {"success": 0, "failed": 0, "partial": 0}
+        return {"success": 0, "failed": 0, "partial": 0}, True
 
     print(f"Processing {len(entries)} entries from {source_file}")
     print("-" * 60)
 
     results = {"success": 0, "failed": 0, "partial": 0}
+    untracked = 0
 
-    for i, entry_key in enumerate(entries, 1):
-        print(f"\n[{i}/{len(entries)}] Processing {entry_key}")
+    # Long-lived workers pay interpreter startup and the BibTeX parse once,
+    # then pull entries from a shared queue as they become free.
+    pending: queue.SimpleQueue[tuple[str, Future[EntryResult]]] = queue.SimpleQueue()
+    futures: list[Future[EntryResult]] = []
+    for entry_key in entries:
+        future: Future[EntryResult] = Future()
+        pending.put((entry_key, future))
+        futures.append(future)
 
-        # Call the single-entry enrichment script
-        cmd = [sys.executable, "scripts/enrich-single-entry.py", source_file, entry_key]
+    workers = min(MAX_WORKERS, len(entries))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        worker_futures = [
+            executor.submit(run_worker, source_file, pending) for _ in range(workers)
+        ]
 
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
+        # Report in submission order while later entries keep running.
+        for i, (entry_key, future) in enumerate(zip(entries, futures), 1):
+            print(f"\n[{i}/{len(entries)}] Processing {entry_key}")
 
-            # Check the exit code
-            if result.returncode == 0:
-                results["success"] += 1
-                print(f"✓ {entry_key}: Enriched successfully")
-            elif result.returncode == 2:
-                results["partial"] += 1
-                print(f"⚠ {entry_key}: Processed but no enrichment indicators")
-            else:
-                results["failed"] += 1
-                print(f"✗ {entry_key}: Failed to enrich")
-                if result.stderr:
-                    print(f"  Error: {result.stderr.strip()}")
-
-            # Print any output
-            if result.stdout:
-                for line in result.stdout.strip().split("\n"):
-                    if not line.startswith("ENRICHMENT_REQUIRED:"):
+            try:
+                returncode, lines = future.result()
+
+                # Check the exit code
+                if returncode == 0:
+                    results["success"] += 1
+                    print(f"✓ {entry_key}: Enriched successfully")
+                elif returncode == 2:
+                    results["partial"] += 1
+                    print(f"⚠ {entry_key}: Processed but no enrichment indicators")
+                elif returncode is None:
+                    results["failed"] += 1
+                    untracked += 1
+                    print(f"✗ {entry_key}: Worker exited before reporting a result")
+                else:
+                    results["failed"] += 1
+                    print(f"✗ {entry_key}: Failed to enrich")
+
+                # Print any output
+                for line in lines:
+                    if line.startswith(TRACKING_FAILED_PREFIX):
+                        untracked += 1
+                        print(f"✗ {entry_key}: Result was not tracked")
+                    elif not line.startswith("ENRICHMENT_REQUIRED:"):
                         print(f"  {line}")
 
-        except Exception as e:
-            results["failed"] += 1
-            print(f"✗ {entry_key}: Error running enrichment: {e}")
+            except Exception as e:
+                results["failed"] += 1
+                print(f"✗ {entry_key}: Error running enrichment: {e}")
 
-    return results
+        # Workers finish once the queue is drained; report anything that
+        # went wrong after their last entry.
+        all_tracked = untracked == 0
+        for worker_future in worker_futures:
+            try:
+                problems = worker_future.result()
+            except Exception as e:
+                problems = [f"Error stopping worker: {e}"]
+            if problems:
+                all_tracked = False
+                print(f"\n✗ Enrichment worker failed: {problems[0]}")
+                for line in problems[1:]:
+                    print(f"  {line}")
+
+    return results, all_tracked
 
 
 def main() -> None:
@@ -99,7 +231,7 @@ def main() -> None:
         sys.exit(1)
 
     # Process the batch
-    results = process_batch(batch_file)
+    results, all_tracked = process_batch(batch_file)
 
     # Print summary
     print("\n" + "=" * 60)
@@ -111,11 +243,14 @@ def main() -> None:
     print(f"─ Total:      {sum(results.values())}")
     print("=" * 60)
 
-    # All tracking is already done by enrich-single-entry.py
-    print("\nAll results have been tracked in the database.")
+    # Tracking is done by enrich-single-entry.py before each status line
+    if all_tracked:
+        print("\nAll results have been tracked in the database.")
+    else:
+        print("\n✗ Some results may be missing from the database.")
 
     # Exit with appropriate code
-    if results["failed"] > 0:
+    if results["failed"] > 0 or not all_tracked:
         sys.exit(1)
     elif results["partial"] > 0:
         sys.exit(2)
@@ -48,7 +48,7 @@ class OpsConfig:
     issue_limit_per_type: int
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Issue:
     file_path: str
     entry_key: str | None
@@ -69,7 +69,7 @@ class FileResult:
     sha256: str
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class EntryResult:
     file_path: str
     entry_key: str
@@ -299,6 +299,14 @@ def init_db(db_path: Path) -> None:
         """
     )
 
+    # Covers the per-run GROUP BY severity / issue_type aggregations in `report`.
+    cur.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_ops_issues_run
+        ON ops_issues(run_id, severity, issue_type)
+        """
+    )
+
     conn.commit()
     conn.close()
 
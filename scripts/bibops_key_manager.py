@@ -82,7 +82,7 @@ def _expand_targets(targets: list[str]) -> tuple[list[Path], list[str]]:
 
         for item in matched:
             path = Path(item)
-            if path.exists() and path.is_file() and path.suffix.lower() == ".bib":
+            if path.suffix.lower() == ".bib" and path.is_file():
                 paths.append(path.resolve())
 
     return sorted(set(paths)), unresolved
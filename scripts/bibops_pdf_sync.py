@@ -573,7 +573,7 @@ def expand_targets(targets: list[str]) -> tuple[list[Path], list[str]]:
 
         for item in matches:
             path = Path(item).resolve()
-            if path.is_file() and path.suffix.lower() == ".bib" and path not in seen:
+            if path.suffix.lower() == ".bib" and path not in seen and path.is_file():
                 seen.add(path)
                 paths.append(path)
 
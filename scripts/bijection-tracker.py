@@ -14,21 +14,49 @@ import argparse
 import os
 import sqlite3
 import json
+import mmap
 from pathlib import Path
 from datetime import datetime
 import hashlib
 import re
-from glob import glob
-from typing import Dict, List, Tuple, Optional, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from glob import iglob
+from typing import Dict, Iterator, List, Tuple, Optional, Any, Union
 
 from core.bibtex_io import parse_bib_file
 
+try:
+    import orjson
+except ModuleNotFoundError:  # optional speedup; stdlib json is used without it
+    orjson = None
+
+try:
+    import xxhash
+except ModuleNotFoundError:  # optional speedup; MD5 is used without it
+    xxhash = None
+
 # Database file
 DB_FILE = "bibliography.db"
 
 # Base directory for all PDFs
 BASE_DIR = Path("/home/b/documents")
 
+# Zotero-style file field: ":/path/to/file:type"
+FILE_FIELD_RE = re.compile(r"^:(.+):\w+$")
+
+# Rows written by --update before an intermediate commit
+UPDATE_COMMIT_ROWS = 10000
+
+# bijection_status rows kept; older check results are pruned
+STATUS_HISTORY_ROWS = 500
+
+# Change-detection hash for PDFs: "xxh3" (needs xxhash) or "md5"
+HASH_ALGO = os.environ.get("BIB_HASH", "xxh3")
+
+# Document formats picked up when scanning the PDF directories
+DOCUMENT_EXTENSIONS = (".pdf", ".epub")
+
 # Mapping of BibTeX entry types to subdirectories
 # Each entry type maps to a directory with the EXACT same name
 TYPE_TO_DIR = {
@@ -52,9 +80,42 @@ TYPE_TO_DIR = {
 }
 
 
-def init_database() -> None:
+# Applied to every connection: WAL lets --check read while --update writes,
+# and synchronous=NORMAL is safe under WAL while avoiding a sync per commit
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA cache_size=-65536;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA busy_timeout=60000;
+"""
+
+# Fixed upsert statements, each prepared once per executemany call
+INSERT_ENTRY_SQL = """
+    INSERT OR REPLACE INTO bib_entries
+    (file_path, entry_key, entry_type, has_pdf_field, pdf_url,
+     has_file_field, file_field_path, expected_pdf_path, last_checked)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+INSERT_PDF_SQL = """
+    INSERT OR REPLACE INTO pdf_files
+    (pdf_path, file_size, file_hash, entry_key, entry_type, status, mtime_ns,
+     scan_epoch, last_seen)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the tracking database with the shared connection pragmas."""
+    conn = sqlite3.connect(DB_FILE)
+    conn.executescript(CONNECTION_PRAGMAS)
+    return conn
+
+
+def init_database(conn: sqlite3.Connection) -> None:
     """Initialize the bijection tracking tables."""
-    conn: sqlite3.Connection = sqlite3.connect(DB_FILE)
     c: sqlite3.Cursor = conn.cursor()
 
     # Table for BibTeX entry tracking
@@ -84,10 +145,19 @@ def init_database() -> None:
             entry_key TEXT,
             entry_type TEXT,
             last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            status TEXT  -- 'matched', 'orphaned', 'mismatched'
+            status TEXT,  -- 'matched', 'orphaned', 'mismatched'
+            mtime_ns INTEGER,
+            scan_epoch INTEGER
         )
     """)
 
+    # Databases created by older versions lack the later columns
+    c.execute("PRAGMA table_info(pdf_files)")
+    columns = [col[1] for col in c.fetchall()]
+    for column in ("mtime_ns", "scan_epoch"):
+        if column not in columns:
+            c.execute(f"ALTER TABLE pdf_files ADD COLUMN {column} INTEGER")
+
     # Table for bijection status
     c.execute("""
         CREATE TABLE IF NOT EXISTS bijection_status (
@@ -110,9 +180,58 @@ def init_database() -> None:
     )
     c.execute("CREATE INDEX IF NOT EXISTS idx_pdfs_key ON pdf_files(entry_key)")
     c.execute("CREATE INDEX IF NOT EXISTS idx_pdfs_status ON pdf_files(status)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_pdfs_epoch ON pdf_files(scan_epoch)")
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_status_time ON bijection_status(check_time DESC)"
+    )
+    # Covers the existence joins on (pdf_path, status) without touching the table
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_pdfs_path_status ON pdf_files(pdf_path, status)"
+    )
+    # Composite and partial indices matching the bijection join predicates
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_entries_expected_has_file "
+        "ON bib_entries(expected_pdf_path, has_file_field)"
+    )
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_pdfs_orphaned "
+        "ON pdf_files(pdf_path) WHERE status = 'orphaned'"
+    )
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_pdfs_not_deleted "
+        "ON pdf_files(pdf_path) WHERE status != 'deleted'"
+    )
+
+    # Per-connection view of each entry with its expected PDF (if tracked);
+    # the analysis queries below all read from it
+    c.execute("""
+        CREATE TEMP VIEW IF NOT EXISTS entry_pdfs AS
+        SELECT
+            be.*,
+            pf.id AS pf_id,
+            pf.status AS pf_status,
+            COALESCE(pf.status != 'deleted', 0) AS pdf_exists
+        FROM bib_entries be
+        LEFT JOIN pdf_files pf ON be.expected_pdf_path = pf.pdf_path
+    """)
+
+    # Refresh planner statistics so the indices above are actually chosen
+    c.execute("ANALYZE bib_entries")
+    c.execute("ANALYZE pdf_files")
 
     conn.commit()
-    conn.close()
+
+
+def _new_hasher() -> Any:
+    """Return a fresh hasher for HASH_ALGO, falling back to MD5."""
+    if HASH_ALGO == "xxh3" and xxhash is not None:
+        return xxhash.xxh3_64()
+    return hashlib.md5()
+
+
+# Digest length of the active algorithm; cached hashes of another length were
+# produced by a different algorithm and are recomputed
+HASH_HEX_LEN = len(_new_hasher().hexdigest())
 
 
 def get_file_hash(file_path: str, quick: bool = True) -> Optional[str]:
@@ -121,7 +240,7 @@ def get_file_hash(file_path: str, quick: bool = True) -> Optional[str]:
         return None
 
     file_size = Path(file_path).stat().st_size
-    hasher = hashlib.md5()
+    hasher = _new_hasher()
 
     with open(file_path, "rb") as f:
         if quick and file_size > 2 * 1024 * 1024:
@@ -129,29 +248,32 @@ def get_file_hash(file_path: str, quick: bool = True) -> Optional[str]:
             hasher.update(f.read(1024 * 1024))
             f.seek(-1024 * 1024, 2)
             hasher.update(f.read())
-        else:
-            # For small files or full mode, hash entire file
-            while chunk := f.read(8192):
-                hasher.update(chunk)
+        elif file_size:
+            # For small files or full mode, hash entire file through one mapping
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
 
     return hasher.hexdigest()
 
 
-def get_expected_pdf_path(entry_type: str, entry_key: str) -> str:
-    """Get the expected PDF path for a BibTeX entry."""
-    subdir = TYPE_TO_DIR.get(entry_type.lower(), "misc")
-    return str(BASE_DIR / subdir / f"{entry_key}.pdf")
+@lru_cache(maxsize=None)
+def _type_dir(base_dir: Path, entry_type: str) -> str:
+    """Return the PDF directory for an entry type as a string."""
+    return str(base_dir / TYPE_TO_DIR.get(entry_type.lower(), "misc"))
 
 
-def update_bib_entries(bib_file: str) -> int:
-    """Update database with entries from a BibTeX file."""
-    conn: sqlite3.Connection = sqlite3.connect(DB_FILE)
-    c: sqlite3.Cursor = conn.cursor()
+def get_expected_pdf_path(entry_type: str, entry_key: str) -> str:
+    """Get the expected PDF path for a BibTeX entry."""
+    return f"{_type_dir(BASE_DIR, entry_type)}/{entry_key}.pdf"
 
-    bib_db = parse_bib_file(Path(bib_file))
 
-    # Update each entry
-    for entry in bib_db.entries:
+def iter_entry_rows(
+    bib_file: str, entries: List[Dict[str, Any]]
+) -> Iterator[Tuple[Any, ...]]:
+    """Yield one bib_entries parameter row per parsed entry."""
+    for entry in entries:
         entry_key = entry.get("ID", "unknown")
         entry_type = entry.get("ENTRYTYPE", "misc")
         has_pdf_field = "pdf" in entry
@@ -162,104 +284,142 @@ def update_bib_entries(bib_file: str) -> int:
         file_field_path = ""
         if has_file_field:
             # Format: :/path/to/file:type
-            match = re.match(r"^:(.+):\w+$", entry.get("file", ""))
+            match = FILE_FIELD_RE.match(entry.get("file", ""))
             if match:
                 file_field_path = match.group(1)
 
         expected_pdf_path = get_expected_pdf_path(entry_type, entry_key)
 
-        # Insert or update entry
-        c.execute(
-            """
-            INSERT OR REPLACE INTO bib_entries 
-            (file_path, entry_key, entry_type, has_pdf_field, pdf_url, 
-             has_file_field, file_field_path, expected_pdf_path, last_checked)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """,
-            (
-                bib_file,
-                entry_key,
-                entry_type,
-                has_pdf_field,
-                pdf_url,
-                has_file_field,
-                file_field_path,
-                expected_pdf_path,
-            ),
+        yield (
+            bib_file,
+            entry_key,
+            entry_type,
+            int(has_pdf_field),
+            pdf_url,
+            int(has_file_field),
+            file_field_path,
+            expected_pdf_path,
         )
 
-    conn.commit()
-    conn.close()
+
+def update_bib_entries(conn: sqlite3.Connection, bib_file: str) -> int:
+    """Update database with entries from a BibTeX file."""
+    c: sqlite3.Cursor = conn.cursor()
+
+    bib_db = parse_bib_file(Path(bib_file))
+
+    # Insert or update all entries; the caller owns the transaction
+    # Rows stream straight from the parsed entries into the statement
+    c.executemany(INSERT_ENTRY_SQL, iter_entry_rows(bib_file, bib_db.entries))
 
     return len(bib_db.entries)
 
 
-def scan_pdf_directory() -> int:
+def scan_pdf_directory(conn: sqlite3.Connection) -> int:
     """Scan PDF directories and update database."""
-    conn: sqlite3.Connection = sqlite3.connect(DB_FILE)
     c: sqlite3.Cursor = conn.cursor()
 
-    pdf_count = 0
+    # Every row written by this scan is tagged with a fresh epoch; anything
+    # left with an older one afterwards was not seen on disk
+    c.execute("SELECT COALESCE(MAX(scan_epoch), 0) + 1 FROM pdf_files")
+    scan_epoch: int = c.fetchone()[0]
+
+    # Hashes from the previous scan, reused for files whose size and mtime match
+    c.execute("SELECT pdf_path, file_size, mtime_ns, file_hash FROM pdf_files")
+    known_hashes = {row[0]: row[1:] for row in c.fetchall()}
+
+    # Every path some entry points at, for O(1) matched/orphaned checks
+    c.execute("""
+        SELECT expected_pdf_path FROM bib_entries
+        UNION
+        SELECT file_field_path FROM bib_entries WHERE file_field_path != ''
+    """)
+    known_paths = {row[0] for row in c}
+
+    # (path, key, type, size, mtime_ns, cached hash or None) for every document
+    found: List[Tuple[str, str, str, int, int, Optional[str]]] = []
 
     for entry_type, subdir in TYPE_TO_DIR.items():
         dir_path = BASE_DIR / subdir
         # Skip if directory doesn't exist or is a symlink (to avoid double-counting)
         if dir_path.exists() and not dir_path.is_symlink():
-            # Check for PDFs and EPUBs (and potentially other formats)
-            for pattern in ["*.pdf", "*.epub"]:
-                for file_path in dir_path.glob(pattern):
-                    full_path = str(file_path)
-                    entry_key = file_path.stem
-                    file_size = file_path.stat().st_size
-                    file_hash = get_file_hash(full_path, quick=True)
-
-                    # Check if this file matches any entry
-                    c.execute(
-                        """
-                        SELECT COUNT(*) FROM bib_entries 
-                        WHERE expected_pdf_path = ? OR file_field_path = ?
-                    """,
-                        (full_path, full_path),
-                    )
-
-                    has_entry = c.fetchone()[0] > 0
-                    status = "matched" if has_entry else "orphaned"
-
-                    # Insert or update PDF record
-                    c.execute(
-                        """
-                        INSERT OR REPLACE INTO pdf_files
-                        (pdf_path, file_size, file_hash, entry_key, entry_type, status, last_seen)
-                        VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    """,
+            # One directory read per subdir; DirEntry caches the file type and stat
+            with os.scandir(dir_path) as it:
+                for dir_entry in it:
+                    # Check for PDFs and EPUBs (and potentially other formats)
+                    entry_key, ext = os.path.splitext(dir_entry.name)
+                    if ext not in DOCUMENT_EXTENSIONS or not dir_entry.is_file():
+                        continue
+
+                    full_path = dir_entry.path
+                    st = dir_entry.stat()
+                    cached = known_hashes.get(full_path)
+                    file_hash = None
+                    if (
+                        cached
+                        and cached[:2] == (st.st_size, st.st_mtime_ns)
+                        and len(cached[2] or "") == HASH_HEX_LEN
+                    ):
+                        file_hash = cached[2]
+                    found.append(
                         (
                             full_path,
-                            file_size,
-                            file_hash,
                             entry_key,
                             entry_type,
-                            status,
-                        ),
+                            st.st_size,
+                            st.st_mtime_ns,
+                            file_hash,
+                        )
                     )
 
-                    pdf_count += 1
+    # Hash new or changed files concurrently; the work is mostly file reads,
+    # which release the GIL
+    to_hash = [item[0] for item in found if item[5] is None]
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        new_hashes = dict(zip(to_hash, executor.map(get_file_hash, to_hash)))
+
+    rows: List[Tuple[Any, ...]] = []
+    for full_path, entry_key, entry_type, file_size, mtime_ns, file_hash in found:
+        if file_hash is None:
+            file_hash = new_hashes[full_path]
+
+        status = "matched" if full_path in known_paths else "orphaned"
+
+        rows.append(
+            (
+                full_path,
+                file_size,
+                file_hash,
+                entry_key,
+                entry_type,
+                status,
+                mtime_ns,
+                scan_epoch,
+            )
+        )
+
+    # Insert or update all PDF records and sweep stale ones in one transaction
+    c.execute("BEGIN IMMEDIATE")
+    c.executemany(INSERT_PDF_SQL, rows)
 
     # Mark PDFs not seen in this scan as potentially deleted
-    c.execute("""
+    c.execute(
+        """
         UPDATE pdf_files 
         SET status = 'deleted' 
-        WHERE last_seen < datetime('now', '-1 minute')
-    """)
+        WHERE (scan_epoch IS NULL OR scan_epoch < ?) AND status != 'deleted'
+    """,
+        (scan_epoch,),
+    )
 
     conn.commit()
-    conn.close()
 
-    return pdf_count
+    return len(rows)
 
 
-def calculate_bijection() -> Dict[str, Union[int, float]]:
+def calculate_bijection(conn: sqlite3.Connection) -> Dict[str, Union[int, float]]:
     """Calculate bijection statistics."""
-    conn: sqlite3.Connection = sqlite3.connect(DB_FILE)
     c: sqlite3.Cursor = conn.cursor()
 
     # Total entries
@@ -272,28 +432,25 @@ def calculate_bijection() -> Dict[str, Union[int, float]]:
 
     # Perfect matches (entry has file field pointing to existing PDF)
     c.execute("""
-        SELECT COUNT(DISTINCT be.entry_key)
-        FROM bib_entries be
-        JOIN pdf_files pf ON be.expected_pdf_path = pf.pdf_path
-        WHERE be.has_file_field = 1 AND pf.status = 'matched'
+        SELECT COUNT(DISTINCT entry_key)
+        FROM entry_pdfs
+        WHERE has_file_field = 1 AND pf_status = 'matched'
     """)
     perfect_matches = c.fetchone()[0]
 
     # Entries missing PDF
     c.execute("""
         SELECT COUNT(*)
-        FROM bib_entries be
-        LEFT JOIN pdf_files pf ON be.expected_pdf_path = pf.pdf_path
-        WHERE pf.id IS NULL OR pf.status = 'deleted'
+        FROM entry_pdfs
+        WHERE pdf_exists = 0
     """)
     entries_missing_pdf = c.fetchone()[0]
 
     # Entries missing file field (but PDF exists)
     c.execute("""
         SELECT COUNT(*)
-        FROM bib_entries be
-        JOIN pdf_files pf ON be.expected_pdf_path = pf.pdf_path
-        WHERE be.has_file_field = 0 AND pf.status != 'deleted'
+        FROM entry_pdfs
+        WHERE has_file_field = 0 AND pdf_exists = 1
     """)
     entries_missing_file_field = c.fetchone()[0]
 
@@ -324,9 +481,18 @@ def calculate_bijection() -> Dict[str, Union[int, float]]:
             bijection_score,
         ),
     )
+    c.execute(
+        """
+        DELETE FROM bijection_status WHERE id NOT IN (
+            SELECT id FROM bijection_status
+            ORDER BY check_time DESC, id DESC
+            LIMIT ?
+        )
+    """,
+        (STATUS_HISTORY_ROWS,),
+    )
 
     conn.commit()
-    conn.close()
 
     return {
         "total_entries": total_entries,
@@ -339,28 +505,25 @@ def calculate_bijection() -> Dict[str, Union[int, float]]:
     }
 
 
-def get_action_items() -> Dict[str, List[Tuple[Any, ...]]]:
+def get_action_items(conn: sqlite3.Connection) -> Dict[str, List[Tuple[Any, ...]]]:
     """Get actionable items to improve bijection."""
-    conn: sqlite3.Connection = sqlite3.connect(DB_FILE)
     c: sqlite3.Cursor = conn.cursor()
 
     actions: Dict[str, List[Tuple[Any, ...]]] = {}
 
     # Entries needing file field
     c.execute("""
-        SELECT be.entry_key, be.file_path, be.expected_pdf_path
-        FROM bib_entries be
-        JOIN pdf_files pf ON be.expected_pdf_path = pf.pdf_path
-        WHERE be.has_file_field = 0 AND pf.status != 'deleted'
+        SELECT entry_key, file_path, expected_pdf_path
+        FROM entry_pdfs
+        WHERE has_file_field = 0 AND pdf_exists = 1
     """)
     actions["needs_file_field"] = c.fetchall()
 
     # Entries needing PDF download
     c.execute("""
-        SELECT be.entry_key, be.file_path, be.pdf_url
-        FROM bib_entries be
-        LEFT JOIN pdf_files pf ON be.expected_pdf_path = pf.pdf_path
-        WHERE be.has_pdf_field = 1 AND (pf.id IS NULL OR pf.status = 'deleted')
+        SELECT entry_key, file_path, pdf_url
+        FROM entry_pdfs
+        WHERE has_pdf_field = 1 AND pdf_exists = 0
     """)
     actions["needs_download"] = c.fetchall()
 
@@ -383,13 +546,11 @@ def get_action_items() -> Dict[str, List[Tuple[Any, ...]]]:
     """)
     actions["mismatched_paths"] = c.fetchall()
 
-    conn.close()
     return actions
 
 
-def export_to_tracking() -> None:
+def export_to_tracking(conn: sqlite3.Connection) -> None:
     """Export bijection data to tracking.json."""
-    conn: sqlite3.Connection = sqlite3.connect(DB_FILE)
     c: sqlite3.Cursor = conn.cursor()
 
     # Get latest status
@@ -418,18 +579,33 @@ def export_to_tracking() -> None:
         "database_counts": {"tracked_entries": entry_count, "tracked_pdfs": pdf_count},
     }
 
-    conn.close()
-
     # Merge with existing tracking.json
     tracking_file = Path("tracking.json")
     if tracking_file.exists():
-        with open(tracking_file, "r") as f:
-            tracking_data = json.load(f)
+        tracking_data = load_tracking(tracking_file)
     else:
         tracking_data = {}
 
     tracking_data["bijection"] = bijection_data
 
+    save_tracking(tracking_file, tracking_data)
+
+
+def load_tracking(tracking_file: Path) -> Dict[str, Any]:
+    """Read tracking.json, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(tracking_file.read_bytes())
+    with open(tracking_file, "r") as f:
+        return json.load(f)
+
+
+def save_tracking(tracking_file: Path, tracking_data: Dict[str, Any]) -> None:
+    """Write tracking.json with two-space indentation."""
+    if orjson is not None:
+        tracking_file.write_bytes(
+            orjson.dumps(tracking_data, option=orjson.OPT_INDENT_2, default=str)
+        )
+        return
     with open(tracking_file, "w") as f:
         json.dump(tracking_data, f, indent=2, default=str)
 
@@ -441,8 +617,7 @@ def import_from_tracking() -> bool:
         print("No tracking.json file found")
         return False
 
-    with open(tracking_file, "r") as f:
-        tracking_data = json.load(f)
+    tracking_data = load_tracking(tracking_file)
 
     if "bijection" not in tracking_data:
         print("No bijection data in tracking.json")
@@ -457,26 +632,39 @@ def import_from_tracking() -> bool:
     return True
 
 
-def update_all(pattern: str) -> int:
+def update_all(conn: sqlite3.Connection, pattern: str) -> int:
     """Update all BibTeX files matching pattern."""
 
     total_entries = 0
     file_count = 0
-
-    for bib_file in sorted(glob(pattern)):
-        if os.path.isfile(bib_file):
-            print(f"Processing {bib_file}...")
-            entries = update_bib_entries(bib_file)
-            total_entries += entries
-            file_count += 1
+    uncommitted = 0
+
+    # All files share one transaction, checkpointed now and then to bound the WAL
+    conn.execute("BEGIN IMMEDIATE")
+    # Stream matches as the directory walk yields them; the stored rows do not
+    # depend on file order
+    for bib_file in iglob(pattern, recursive=True):
+        if os.path.isdir(bib_file):
+            continue
+
+        print(f"Processing {bib_file}...")
+        entries = update_bib_entries(conn, bib_file)
+        total_entries += entries
+        file_count += 1
+
+        uncommitted += entries
+        if uncommitted >= UPDATE_COMMIT_ROWS:
+            conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+            uncommitted = 0
+    conn.commit()
 
     print(f"Updated {total_entries} entries from {file_count} files")
     return total_entries
 
 
-def get_detailed_stats() -> Dict[str, List[Tuple[Any, ...]]]:
+def get_detailed_stats(conn: sqlite3.Connection) -> Dict[str, List[Tuple[Any, ...]]]:
     """Get detailed statistics by file and directory."""
-    conn: sqlite3.Connection = sqlite3.connect(DB_FILE)
     c: sqlite3.Cursor = conn.cursor()
 
     # Stats by BibTeX file
@@ -484,10 +672,10 @@ def get_detailed_stats() -> Dict[str, List[Tuple[Any, ...]]]:
         SELECT 
             file_path,
             COUNT(*) as total,
-            SUM(CASE WHEN has_pdf_field THEN 1 ELSE 0 END) as with_pdf_url,
-            SUM(CASE WHEN has_file_field THEN 1 ELSE 0 END) as with_file_field,
-            SUM(CASE WHEN expected_pdf_path IN (SELECT pdf_path FROM pdf_files WHERE status != 'deleted') THEN 1 ELSE 0 END) as pdf_exists
-        FROM bib_entries
+            SUM(has_pdf_field) as with_pdf_url,
+            SUM(has_file_field) as with_file_field,
+            SUM(pdf_exists) as pdf_exists
+        FROM entry_pdfs
         GROUP BY file_path
         ORDER BY file_path
     """)
@@ -498,10 +686,10 @@ def get_detailed_stats() -> Dict[str, List[Tuple[Any, ...]]]:
         SELECT 
             entry_type,
             COUNT(*) as total,
-            SUM(CASE WHEN has_pdf_field THEN 1 ELSE 0 END) as with_pdf_url,
-            SUM(CASE WHEN has_file_field THEN 1 ELSE 0 END) as with_file_field,
-            SUM(CASE WHEN expected_pdf_path IN (SELECT pdf_path FROM pdf_files WHERE status != 'deleted') THEN 1 ELSE 0 END) as pdf_exists
-        FROM bib_entries
+            SUM(has_pdf_field) as with_pdf_url,
+            SUM(has_file_field) as with_file_field,
+            SUM(pdf_exists) as pdf_exists
+        FROM entry_pdfs
         GROUP BY entry_type
         ORDER BY total DESC
     """)
@@ -512,8 +700,8 @@ def get_detailed_stats() -> Dict[str, List[Tuple[Any, ...]]]:
         SELECT 
             entry_type,
             COUNT(*) as total,
-            SUM(CASE WHEN status = 'matched' THEN 1 ELSE 0 END) as matched,
-            SUM(CASE WHEN status = 'orphaned' THEN 1 ELSE 0 END) as orphaned,
+            SUM(status = 'matched') as matched,
+            SUM(status = 'orphaned') as orphaned,
             SUM(file_size) / (1024.0 * 1024.0) as total_size_mb
         FROM pdf_files
         WHERE status != 'deleted'
@@ -522,35 +710,45 @@ def get_detailed_stats() -> Dict[str, List[Tuple[Any, ...]]]:
     """)
     pdf_by_type = c.fetchall()
 
-    conn.close()
-
     return {"by_file": by_file, "by_type": by_type, "pdf_by_type": pdf_by_type}
 
 
-def print_top_files(n: int = 5, sort_by: str = "coverage") -> None:
-    """Print top N best and worst files by specified criteria."""
-    conn: sqlite3.Connection = sqlite3.connect(DB_FILE)
-    c: sqlite3.Cursor = conn.cursor()
-
-    # Get stats for all files
-    c.execute("""
-        SELECT 
-            file_path,
-            COUNT(*) as total,
-            SUM(CASE WHEN expected_pdf_path IN (SELECT pdf_path FROM pdf_files WHERE status != 'deleted') THEN 1 ELSE 0 END) as pdf_exists,
-            COUNT(*) - SUM(CASE WHEN expected_pdf_path IN (SELECT pdf_path FROM pdf_files WHERE status != 'deleted') THEN 1 ELSE 0 END) as missing,
-            ROUND(100.0 * SUM(CASE WHEN expected_pdf_path IN (SELECT pdf_path FROM pdf_files WHERE status != 'deleted') THEN 1 ELSE 0 END) / COUNT(*), 1) as coverage
-        FROM bib_entries
-        GROUP BY file_path
-    """)
+def print_top_files(
+    conn: sqlite3.Connection,
+    n: int = 5,
+    sort_by: str = "coverage",
+    by_file: Optional[List[Tuple[Any, ...]]] = None,
+) -> None:
+    """Print top N best and worst files by specified criteria.
 
+    by_file takes get_detailed_stats()["by_file"] when it was already computed
+    in this run, so the per-file aggregation is not repeated.
+    """
     results: List[Tuple[str, int, int, int, float]] = []
-    for row in c.fetchall():
-        file_path, total, exists, missing, coverage = row
-        file_name = Path(file_path).name
-        results.append((file_name, total, exists, missing, coverage))
 
-    conn.close()
+    if by_file is not None:
+        for file_path, total, _, _, exists in by_file:
+            coverage = round(100.0 * exists / total, 1)
+            results.append((Path(file_path).name, total, exists, total - exists, coverage))
+    else:
+        c: sqlite3.Cursor = conn.cursor()
+
+        # Get stats for all files
+        c.execute("""
+            SELECT 
+                file_path,
+                COUNT(*) as total,
+                SUM(pdf_exists) as pdf_exists,
+                COUNT(*) - SUM(pdf_exists) as missing,
+                ROUND(100.0 * SUM(pdf_exists) / COUNT(*), 1) as coverage
+            FROM entry_pdfs
+            GROUP BY file_path
+        """)
+
+        for row in c.fetchall():
+            file_path, total, exists, missing, coverage = row
+            file_name = Path(file_path).name
+            results.append((file_name, total, exists, missing, coverage))
 
     # Sort based on criteria
     if sort_by == "coverage":
@@ -589,7 +787,7 @@ def print_top_files(n: int = 5, sort_by: str = "coverage") -> None:
 def print_summary(
     stats: Dict[str, Union[int, float]],
     actions: Optional[Dict[str, List[Tuple[Any, ...]]]],
-    detailed: bool = False,
+    detailed_stats: Optional[Dict[str, List[Tuple[Any, ...]]]] = None,
 ) -> None:
     """Print summary report."""
     print("\n" + "=" * 70)
@@ -630,8 +828,7 @@ def print_summary(
     print(f"  Entries missing file field: {stats['entries_missing_file_field']}")
     print(f"  Orphaned PDFs: {stats['orphaned_pdfs']}")
 
-    if detailed:
-        detailed_stats = get_detailed_stats()
+    if detailed_stats:
 
         # By file breakdown
         print("\n📁 BY BIBTEX FILE")
@@ -752,74 +949,84 @@ Examples:
 
     args = parser.parse_args()
 
-    # Initialize database
-    init_database()
-
-    if args.import_data:
-        import_from_tracking()
-        return
-
-    if args.update:
-        # Full update
-        print("Updating BibTeX entries...")
-        update_all(args.update)
-
-        print("\nScanning PDF files...")
-        pdf_count = scan_pdf_directory()
-        print(f"Found {pdf_count} PDFs")
-
-    if args.update or args.check:
-        # Calculate bijection
-        stats = calculate_bijection()
-
-        if args.json:
-            output = {"statistics": stats, "timestamp": datetime.now().isoformat()}
-            if args.actions:
-                actions = get_action_items()
-                output["actions"] = {
-                    "needs_file_field": len(actions["needs_file_field"]),
-                    "needs_download": len(actions["needs_download"]),
-                    "orphaned_pdfs": len(actions["orphaned_pdfs"]),
-                    "mismatched_paths": len(actions["mismatched_paths"]),
-                }
-            print(json.dumps(output, indent=2))
-        else:
-            actions = get_action_items() if args.actions else None
-            print_summary(stats, actions, detailed=args.detailed)
-
-            if args.export_lists and actions:
-                # Create tmp directory
-                Path("tmp").mkdir(exist_ok=True)
-
-                # Export action lists
-                if actions["needs_file_field"]:
-                    with open("tmp/needs-file-field.txt", "w") as f:
-                        for entry_key, file_path, pdf_path in actions[
-                            "needs_file_field"
-                        ]:
-                            f.write(f"{entry_key}\t{file_path}\t{pdf_path}\n")
-                    print("\nCreated tmp/needs-file-field.txt")
-
-                if actions["needs_download"]:
-                    with open("tmp/needs-download.txt", "w") as f:
-                        for entry_key, file_path, pdf_url in actions["needs_download"]:
-                            f.write(f"{entry_key}\t{file_path}\t{pdf_url}\n")
-                    print("Created tmp/needs-download.txt")
-
-                if actions["orphaned_pdfs"]:
-                    with open("tmp/orphaned-pdfs.txt", "w") as f:
-                        for pdf_path, entry_key, file_size in actions["orphaned_pdfs"]:
-                            size_mb = file_size / (1024 * 1024)
-                            f.write(f"{pdf_path}\t{entry_key}\t{size_mb:.1f}MB\n")
-                    print("Created tmp/orphaned-pdfs.txt")
-
-    # Handle --top argument (can work independently or with update/check)
-    if args.top:
-        print_top_files(n=args.top, sort_by=args.sort_by)
-
-    if args.export:
-        export_to_tracking()
-        print("Exported bijection data to tracking.json")
+    # One connection for the whole run keeps the pragmas and schema cache warm
+    conn = _connect()
+    try:
+        # Initialize database
+        init_database(conn)
+
+        if args.import_data:
+            import_from_tracking()
+            return
+
+        if args.update:
+            # Full update
+            print("Updating BibTeX entries...")
+            update_all(conn, args.update)
+
+            print("\nScanning PDF files...")
+            pdf_count = scan_pdf_directory(conn)
+            print(f"Found {pdf_count} PDFs")
+
+        detailed_stats = None
+
+        if args.update or args.check:
+            # Calculate bijection
+            stats = calculate_bijection(conn)
+
+            if args.json:
+                output = {"statistics": stats, "timestamp": datetime.now().isoformat()}
+                if args.actions:
+                    actions = get_action_items(conn)
+                    output["actions"] = {
+                        "needs_file_field": len(actions["needs_file_field"]),
+                        "needs_download": len(actions["needs_download"]),
+                        "orphaned_pdfs": len(actions["orphaned_pdfs"]),
+                        "mismatched_paths": len(actions["mismatched_paths"]),
+                    }
+                print(json.dumps(output, indent=2))
+            else:
+                actions = get_action_items(conn) if args.actions else None
+                if args.detailed:
+                    detailed_stats = get_detailed_stats(conn)
+                print_summary(stats, actions, detailed_stats)
+
+                if args.export_lists and actions:
+                    # Create tmp directory
+                    Path("tmp").mkdir(exist_ok=True)
+
+                    # Export action lists
+                    if actions["needs_file_field"]:
+                        with open("tmp/needs-file-field.txt", "w") as f:
+                            for entry_key, file_path, pdf_path in actions[
+                                "needs_file_field"
+                            ]:
+                                f.write(f"{entry_key}\t{file_path}\t{pdf_path}\n")
+                        print("\nCreated tmp/needs-file-field.txt")
+
+                    if actions["needs_download"]:
+                        with open("tmp/needs-download.txt", "w") as f:
+                            for entry_key, file_path, pdf_url in actions["needs_download"]:
+                                f.write(f"{entry_key}\t{file_path}\t{pdf_url}\n")
+                        print("Created tmp/needs-download.txt")
+
+                    if actions["orphaned_pdfs"]:
+                        with open("tmp/orphaned-pdfs.txt", "w") as f:
+                            for pdf_path, entry_key, file_size in actions["orphaned_pdfs"]:
+                                size_mb = file_size / (1024 * 1024)
+                                f.write(f"{pdf_path}\t{entry_key}\t{size_mb:.1f}MB\n")
+                        print("Created tmp/orphaned-pdfs.txt")
+
+        # Handle --top argument (can work independently or with update/check)
+        if args.top:
+            by_file = detailed_stats["by_file"] if detailed_stats else None
+            print_top_files(conn, n=args.top, sort_by=args.sort_by, by_file=by_file)
+
+        if args.export:
+            export_to_tracking(conn)
+            print("Exported bijection data to tracking.json")
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
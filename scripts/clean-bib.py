@@ -1,26 +1,38 @@
 #!/usr/bin/env python3
 
 import argparse
+import io
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 from typing import Any
 
 from core.bibtex_io import make_bib_database, parse_bib_text, write_bib_file
 
+# Literal EOF markers left behind by shell heredocs
+EOF_RE = re.compile(r"\bEOF\b")
+# str.translate table deleting control characters other than newline, tab
+# and carriage return
+CTRL_TABLE = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F])
+
 
 def clean_entry_fields(entry: dict[str, Any]) -> dict[str, Any]:
     """Clean individual entry fields of common artifacts."""
     for field, value in entry.items():
         if isinstance(value, str):
             # Remove literal EOF markers
-            value = re.sub(r"\bEOF\b", "", value)
+            if "EOF" in value:
+                value = EOF_RE.sub("", value)
             # Remove other control characters
-            value = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", value)
+            value = value.translate(CTRL_TABLE)
             # Remove excess whitespace
             value = " ".join(value.split())
             # Clean up common shell artifacts
-            value = value.replace("\\n", " ").replace("\\t", " ")
+            if "\\" in value:
+                value = value.replace("\\n", " ").replace("\\t", " ")
             entry[field] = value
     return entry
 
@@ -56,9 +68,10 @@ def clean_bib_file(
 
         # Clean the raw content first
         # Remove literal EOF markers that might be in the text
-        content = re.sub(r"\bEOF\b", "", content)
+        if "EOF" in content:
+            content = EOF_RE.sub("", content)
         # Remove control characters except newlines and tabs
-        content = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", content)
+        content = content.translate(CTRL_TABLE)
 
         bib_db = parse_bib_text(content)
 
@@ -84,6 +97,15 @@ def clean_bib_file(
         return False
 
 
+def _clean_worker(job: tuple[str, str | None, bool]) -> tuple[bool, str, str]:
+    """Run clean_bib_file in a worker process, capturing its output for the parent."""
+    input_path, output_path, backup = job
+    out, err = io.StringIO(), io.StringIO()
+    with redirect_stdout(out), redirect_stderr(err):
+        ok = clean_bib_file(input_path, output_path, backup=backup)
+    return ok, out.getvalue(), err.getvalue()
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Clean BibTeX files of stray characters and artifacts"
@@ -106,6 +128,7 @@ def main() -> None:
     success_count = 0
     total_count = len(args.files)
 
+    jobs: list[tuple[str, str | None, bool]] = []
     for file_path in args.files:
         if args.in_place:
             output_path = file_path
@@ -113,9 +136,20 @@ def main() -> None:
             output_path = args.output
         else:
             output_path = None
+        jobs.append((file_path, output_path, not args.no_backup))
 
-        if clean_bib_file(file_path, output_path, backup=not args.no_backup):
-            success_count += 1
+    if total_count == 1:
+        input_path, output_path, backup = jobs[0]
+        success_count = int(clean_bib_file(input_path, output_path, backup=backup))
+    else:
+        # Files are independent; clean them in parallel and replay each
+        # file's output in input order
+        workers = min(total_count, os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for ok, out, err in executor.map(_clean_worker, jobs):
+                sys.stdout.write(out)
+                sys.stderr.write(err)
+                success_count += ok
 
     print(f"\nCleaned {success_count}/{total_count} files successfully")
     if success_count < total_count:
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Remove all @comment entries and inline comments from BibTeX files.
-Uses the repository BibTeX parser to ensure clean, noise-free output.
+Entries are copied through verbatim; files the block scanner cannot follow
+fall back to the repository BibTeX parser.
 
 Usage:
     clean-comments.py file.bib [file2.bib ...]
@@ -10,12 +11,50 @@ Usage:
 """
 
 import argparse
+import io
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 
-from core.bibtex_io import parse_bib_text, write_bib_file
+from core.bibtex_io import iter_raw_blocks, parse_bib_text, write_bib_file
 from core.bibmeta import find_inline_bibmeta_blocks
 
+NON_ENTRY_BLOCKS = {"string", "preamble"}
+
+
+def strip_comments(content: str) -> tuple[str, int, int] | None:
+    """Drop @comment blocks and stray top-level text without parsing entries.
+
+    Returns (output, entry_count, comment_count), or None when the text does not
+    look like a sequence of well-formed @blocks so the caller can fall back to
+    the full parser.
+    """
+    blocks: list[str] = []
+    entry_count = 0
+    comment_count = 0
+    pos = 0
+    try:
+        for kind, start, end in iter_raw_blocks(content):
+            # Anything but whitespace between blocks is an implicit comment
+            if content[pos:start].strip():
+                comment_count += 1
+            if kind == "comment":
+                comment_count += 1
+            else:
+                blocks.append(content[start:end])
+                if kind not in NON_ENTRY_BLOCKS:
+                    entry_count += 1
+            pos = end
+    except ValueError:
+        return None
+    if content[pos:].strip():
+        comment_count += 1
+
+    output = "\n\n".join(blocks) + "\n" if blocks else ""
+    return output, entry_count, comment_count
+
 
 def clean_file(filepath: Path, in_place: bool = False) -> bool:
     """Process a single BibTeX file to remove all comments."""
@@ -32,39 +71,45 @@ def clean_file(filepath: Path, in_place: bool = False) -> bool:
             return False
         preserved_bibmeta = bibmeta_blocks[0].raw if bibmeta_blocks else ""
 
-        bib_db = parse_bib_text(content)
+        stripped = strip_comments(content)
+        if stripped is not None:
+            output, original_count, comment_count = stripped
+        else:
+            bib_db = parse_bib_text(content)
+
+            # Count original entries and comments
+            original_count = len(bib_db.entries)
+            comment_count = len(bib_db.comments)
 
-        # Count original entries and comments
-        original_count = len(bib_db.entries)
-        comment_count = len(bib_db.comments)
+        # Nothing to strip: skip the serialize round trip entirely
+        if in_place and comment_count == 0:
+            print(f"✓ {filepath}: No comments found, file unchanged")
+            return True
 
-        # Clear all comments (both @comment entries and inline comments)
-        bib_db.comments = []
+        if stripped is None:
+            # Clear all comments (both @comment entries and inline comments)
+            bib_db.comments = []
 
-        temp_path = filepath.with_suffix(".bib.clean-comments.tmp")
-        write_bib_file(temp_path, bib_db)
-        output = temp_path.read_text(encoding="utf-8")
-        temp_path.unlink(missing_ok=True)
+            temp_path = filepath.with_suffix(".bib.clean-comments.tmp")
+            write_bib_file(temp_path, bib_db)
+            output = temp_path.read_text(encoding="utf-8")
+            temp_path.unlink(missing_ok=True)
         if preserved_bibmeta:
             output = f"{preserved_bibmeta}\n\n{output.lstrip()}"
 
         if in_place:
-            # Only modify if there were comments to remove
-            if comment_count > 0:
-                # Create backup
-                backup_path = filepath.with_suffix(".bib.backup")
-                with open(backup_path, "w", encoding="utf-8") as f:
-                    f.write(content)
-
-                # Write clean content
-                with open(filepath, "w", encoding="utf-8") as f:
-                    f.write(output)
-
-                print(
-                    f"✓ {filepath}: Removed {comment_count} comments, kept {original_count} entries (backup: {backup_path})"
-                )
-            else:
-                print(f"✓ {filepath}: No comments found, file unchanged")
+            # Create backup
+            backup_path = filepath.with_suffix(".bib.backup")
+            with open(backup_path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+            # Write clean content
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write(output)
+
+            print(
+                f"✓ {filepath}: Removed {comment_count} comments, kept {original_count} entries (backup: {backup_path})"
+            )
         else:
             # Output to stdout
             print(output, end="")
@@ -79,6 +124,15 @@ def clean_file(filepath: Path, in_place: bool = False) -> bool:
         return False
 
 
+def _clean_worker(job: tuple[Path, bool]) -> tuple[bool, str, str]:
+    """Run clean_file in a worker process, capturing its output for the parent."""
+    filepath, in_place = job
+    out, err = io.StringIO(), io.StringIO()
+    with redirect_stdout(out), redirect_stderr(err):
+        ok = clean_file(filepath, in_place)
+    return ok, out.getvalue(), err.getvalue()
+
+
 def find_all_bib_files() -> list[Path]:
     """Find all .bib files in the bibliography directories."""
     bib_files = []
@@ -132,9 +186,18 @@ def main():
     success_count = 0
     total_count = len(files)
 
-    for filepath in files:
-        if clean_file(filepath, args.in_place):
-            success_count += 1
+    if total_count == 1:
+        success_count = int(clean_file(files[0], args.in_place))
+    else:
+        # Files are independent; parse them in parallel and replay each
+        # file's output in input order
+        jobs = [(filepath, args.in_place) for filepath in files]
+        workers = min(total_count, os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for ok, out, err in executor.map(_clean_worker, jobs):
+                sys.stdout.write(out)
+                sys.stderr.write(err)
+                success_count += ok
 
     # Summary for multiple files
     if total_count > 1 and args.in_place:
@@ -1,24 +1,35 @@
 #!/usr/bin/env python3
 
+import bisect
+import mmap
 import re
 import sys
 from pathlib import Path
 
+# "@type{key" at the start of a line; [^\S\n] keeps the match on one line
+ENTRY_KEY_RE = re.compile(
+    rb"^[^\S\n]*@\w+[^\S\n]*\{[^\S\n]*([^,\s]+)", re.MULTILINE | re.IGNORECASE
+)
+NEWLINE_RE = re.compile(rb"\n")
+
 
 def extract_entry_keys(bib_file: str) -> list[tuple[str, int]]:
     """Extract all entry keys from a BibTeX file."""
     keys: list[tuple[str, int]] = []
-    entry_pattern = re.compile(r"^@\w+\s*\{\s*([^,\s]+)", re.IGNORECASE)
 
     try:
-        with open(bib_file, "r", encoding="utf-8") as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if line.startswith("@"):
-                    match = entry_pattern.match(line)
-                    if match:
-                        key = match.group(1).strip()
-                        keys.append((key, line_num))
+        with open(bib_file, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return keys
+            with mm:
+                line_starts = [0] + [m.end() for m in NEWLINE_RE.finditer(mm)]
+                for match in ENTRY_KEY_RE.finditer(mm):
+                    key = match.group(1).decode("utf-8")
+                    line_num = bisect.bisect_right(line_starts, match.start())
+                    keys.append((key, line_num))
     except FileNotFoundError:
         print(f"Error: File '{bib_file}' not found.")
         sys.exit(1)
@@ -30,23 +41,11 @@ def extract_entry_keys(bib_file: str) -> list[tuple[str, int]]:
 
 
 def find_missing_entries(
-    original_file: str, enriched_file: str
+    original_keys: list[tuple[str, int]], enriched_keys: list[tuple[str, int]]
 ) -> list[tuple[str, int]]:
     """Find entries in original that are missing from enriched."""
-    original_keys = extract_entry_keys(original_file)
-    enriched_keys = extract_entry_keys(enriched_file)
-
-    original_key_set = {key for key, _ in original_keys}
     enriched_key_set = {key for key, _ in enriched_keys}
-
-    missing_keys = original_key_set - enriched_key_set
-
-    missing_entries: list[tuple[str, int]] = []
-    for key, line_num in original_keys:
-        if key in missing_keys:
-            missing_entries.append((key, line_num))
-
-    return missing_entries
+    return [(key, line_num) for key, line_num in original_keys if key not in enriched_key_set]
 
 
 def main() -> None:
@@ -69,11 +68,13 @@ def main() -> None:
         print(f"Error: Enriched file '{enriched_file}' does not exist.")
         sys.exit(1)
 
-    missing_entries = find_missing_entries(original_file, enriched_file)
+    original_keys = extract_entry_keys(original_file)
+    enriched_keys = extract_entry_keys(enriched_file)
+    missing_entries = find_missing_entries(original_keys, enriched_keys)
 
     if not missing_entries:
-        original_count = len(extract_entry_keys(original_file))
-        enriched_count = len(extract_entry_keys(enriched_file))
+        original_count = len(original_keys)
+        enriched_count = len(enriched_keys)
         print(f"All entries from {original_file} are present in {enriched_file}")
         print(f"Original: {original_count} entries, Enriched: {enriched_count} entries")
     else:
@@ -49,7 +49,14 @@ from .bibkey import (
     validate_bib_key,
 )
 from .time_utils import now_iso, text_sha256
-from .runtime_paths import RUNTIME_DIR_ENV, bibops_runtime_dir, bibops_runtime_path
+from .runtime_paths import (
+    CACHE_DIR_ENV,
+    RUNTIME_DIR_ENV,
+    bibops_cache_dir,
+    bibops_cache_path,
+    bibops_runtime_dir,
+    bibops_runtime_path,
+)
 
 __all__ = [
     "CachedHttpClient",
@@ -95,7 +102,10 @@ __all__ = [
     "validate_bib_key",
     "now_iso",
     "text_sha256",
+    "CACHE_DIR_ENV",
     "RUNTIME_DIR_ENV",
+    "bibops_cache_dir",
+    "bibops_cache_path",
     "bibops_runtime_dir",
     "bibops_runtime_path",
 ]
@@ -7,7 +7,7 @@ from typing import Any
 
 from .normalization import normalize_text
 
-_STOPWORDS = {
+_STOPWORDS = frozenset({
     "a",
     "an",
     "and",
@@ -32,35 +32,39 @@ _STOPWORDS = {
     "under",
     "over",
     "via",
-}
+})
 
-_GENERIC_KEYWORDS = {
+_GENERIC_KEYWORDS = frozenset({
     "paper",
     "article",
     "study",
     "research",
     "method",
     "approach",
-}
+})
 
 _KEY_PATTERN = re.compile(r"^[a-z][a-z0-9]*\d{4}[a-z0-9]+$")
 _KEY_YEAR_CANDIDATE_PATTERN = re.compile(r"\d{4}")
 _AUTHOR_TOKEN_PATTERN = re.compile(r"^[a-z][a-z0-9]*$")
 _KEYWORD_TOKEN_PATTERN = re.compile(r"^[a-z0-9]+$")
+_NON_LOWER_ALNUM_RUN_PATTERN = re.compile(r"[^a-z0-9]+")
+_NON_WORD_RUN_PATTERN = re.compile(r"[^a-z0-9, ]+")
+_WHITESPACE_RUN_PATTERN = re.compile(r"\s+")
+_MODERN_YEAR_PATTERN = re.compile(r"(19|20)\d{2}")
 _MIN_REASONABLE_YEAR = 1500
 _MAX_REASONABLE_YEAR = date.today().year + 5
 
 
 def _ascii_alnum(value: str) -> str:
     text = unicodedata.normalize("NFKD", value or "").encode("ascii", "ignore").decode("ascii")
-    return re.sub(r"[^a-z0-9]+", "", text.lower())
+    return _NON_LOWER_ALNUM_RUN_PATTERN.sub("", text.lower())
 
 
 def _ascii_words(value: str) -> str:
     text = unicodedata.normalize("NFKD", value or "").encode("ascii", "ignore").decode("ascii")
     text = text.lower()
-    text = re.sub(r"[^a-z0-9, ]+", " ", text)
-    return re.sub(r"\s+", " ", text).strip()
+    text = _NON_WORD_RUN_PATTERN.sub(" ", text)
+    return _WHITESPACE_RUN_PATTERN.sub(" ", text).strip()
 
 
 def _split_authors(author: str | list[str]) -> list[str]:
@@ -72,7 +76,11 @@ def _split_authors(author: str | list[str]) -> list[str]:
 
 
 def parse_key_parts(key: str) -> tuple[str, str, str] | None:
-    value = (key or "").strip().lower()
+    return _parse_lower_key_parts((key or "").strip().lower())
+
+
+def _parse_lower_key_parts(value: str) -> tuple[str, str, str] | None:
+    """parse_key_parts() for a key that is already stripped and lowercased."""
     if not _KEY_PATTERN.fullmatch(value):
         return None
 
@@ -111,15 +119,17 @@ def validate_bib_key(key: str, *, expected_year: str | None = None) -> list[str]
     if not value:
         return ["missing key"]
 
-    if value != value.lower():
+    lower = value.lower()
+    if value != lower:
         issues.append("contains uppercase letters")
 
-    if re.search(r"[^a-zA-Z0-9]", value):
+    # Same as searching for [^a-zA-Z0-9], classified in C by str builtins
+    if not (value.isascii() and value.isalnum()):
         issues.append("contains non-alphanumeric characters")
 
-    parts = parse_key_parts(value)
+    parts = _parse_lower_key_parts(lower)
     if parts is None:
-        if not re.search(r"\d{4}", value):
+        if not _KEY_YEAR_CANDIDATE_PATTERN.search(value):
             issues.append("missing 4-digit year")
         else:
             issues.append("must follow <author><year><keyword> shape")
@@ -146,19 +156,20 @@ def author_token(author: str | list[str]) -> str:
     if "," in first:
         first = first.split(",", 1)[0].strip()
 
-    parts = [p for p in re.split(r"\s+", first) if p]
+    parts = [p for p in _WHITESPACE_RUN_PATTERN.split(first) if p]
     token = _ascii_alnum(parts[-1] if parts else first)
     return token or "paper"
 
 
 def keyword_candidates(title: str, *, limit: int = 5) -> list[str]:
-    words = [w for w in normalize_text(title).split() if w]
-
     out: list[str] = []
     seen: set[str] = set()
+    # Short words and stopwords, only used if the first pass falls short
+    deferred: list[str] = []
 
-    for word in words:
+    for word in normalize_text(title).split():
         if len(word) <= 2 or word in _STOPWORDS:
+            deferred.append(word)
             continue
         token = _ascii_alnum(word)
         if not token or token in seen:
@@ -168,7 +179,7 @@ def keyword_candidates(title: str, *, limit: int = 5) -> list[str]:
         if len(out) >= limit:
             return out
 
-    for word in words:
+    for word in deferred:
         token = _ascii_alnum(word)
         if not token or token in seen:
             continue
@@ -208,7 +219,8 @@ def suggest_bib_keys(
         if len(out) >= limit:
             return out
 
-    fallback = f"{base_author}{year_token}{keyword_token(title)}"
+    # keyword_token(title) is the first candidate, already computed above
+    fallback = f"{base_author}{year_token}{words[0] if words else 'paper'}"
     if fallback not in out:
         out.append(fallback)
     return out[:limit]
@@ -216,7 +228,7 @@ def suggest_bib_keys(
 
 def normalize_year(year: int | str) -> str:
     raw = str(year).strip()
-    match = re.search(r"(19|20)\d{2}", raw)
+    match = _MODERN_YEAR_PATTERN.search(raw)
     if match:
         return match.group(0)
     return "0000"
@@ -2,14 +2,36 @@ from __future__ import annotations
 
 import copy
 import glob
+import hashlib
+import pickle
+import re
 import shutil
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import citerra
 
+from .runtime_paths import bibops_cache_path
+
+BLOCK_INDEX_CACHE_DIR = bibops_cache_path("block-index")
+# Cached indexes kept per cache directory; least recently used go first
+BLOCK_INDEX_CACHE_LIMIT = 64
+# Bump when RawBlockIndex or build_raw_block_index() output changes
+_BLOCK_INDEX_VERSION = 1
+
+# Start of a top-level "@type{" block
+_BLOCK_START_RE = re.compile(r"@\s*([A-Za-z]\w*)\s*\{")
+# Citation key of an entry block, matched at the block's "@"
+_BLOCK_KEY_RE = re.compile(r"@\s*[A-Za-z]\w*\s*\{\s*([^,\s]+)\s*,")
+# Braces and backslash escapes; escaped braces do not count towards depth
+_BRACE_TOKEN_RE = re.compile(r"\\.|[{}]", re.DOTALL)
+# Byte-level twin of _BRACE_TOKEN_RE for scanning mapped files
+_BRACE_TOKEN_BYTES_RE = re.compile(rb"\\.|[{}]", re.DOTALL)
+# Top-level block types that are not bibliographic entries
+NON_ENTRY_BLOCK_TYPES = frozenset({"string", "preamble", "comment"})
+
 
 DEFAULT_FIELD_ORDER = [
     "author",
@@ -45,6 +67,13 @@ class BibDatabase:
     _original_strings: list[tuple[str, Any]] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class RawBlockIndex:
+    entry_count: int
+    # Byte (start, end) of the first entry block for each key
+    spans: dict[str, tuple[int, int]]
+
+
 @dataclass
 class WriteFailureArtifacts:
     original_path: Path
@@ -65,12 +94,12 @@ def resolve_bib_paths(paths_or_globs: list[str]) -> list[Path]:
         if matched:
             for path in matched:
                 p = Path(path).resolve()
-                if p.exists() and p.is_file() and p.suffix.lower() == ".bib" and p not in seen:
+                if p.suffix.lower() == ".bib" and p not in seen and p.is_file():
                     seen.add(p)
                     out.append(p)
             continue
         p = Path(item).resolve()
-        if p.exists() and p.is_file() and p.suffix.lower() == ".bib" and p not in seen:
+        if p.suffix.lower() == ".bib" and p not in seen and p.is_file():
             seen.add(p)
             out.append(p)
     return out
@@ -124,6 +153,158 @@ def parse_bib_file(path: Path) -> BibDatabase:
     return parse_bib_text(path.read_text(encoding="utf-8"))
 
 
+def parse_bib_entries(path: Path) -> list[dict[str, Any]]:
+    """Parse only the entry dicts of a file, reading it natively in citerra.
+
+    The file is never materialised as a Python str and no source or raw-block
+    capture is kept, so the result cannot be written back verbatim; use
+    parse_bib_file() for round trips. Read and decode errors surface as
+    citerra.BibtexParserError rather than OSError/UnicodeDecodeError.
+    """
+    document = citerra.parse_file(
+        str(path),
+        tolerant=False,
+        capture_source=False,
+        preserve_raw=False,
+        expand_values=True,
+        latex_to_unicode=True,
+    )
+    return document.to_dicts()
+
+
+def _match_brace(text: str, open_brace_idx: int) -> int | None:
+    depth = 0
+    for token in _BRACE_TOKEN_RE.finditer(text, open_brace_idx):
+        char = token.group()
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return token.start()
+    return None
+
+
+def iter_raw_blocks(text: str) -> Iterator[tuple[str, int, int]]:
+    """Yield (type, start, end) for each top-level @type{...} block without parsing it.
+
+    type is lowercased and text[start:end] is the block verbatim; anything between
+    blocks is left to the caller. Raises ValueError at an "@" that does not open a
+    brace-balanced block, so callers can fall back to parse_bib_text().
+    """
+    pos = 0
+    while (at := text.find("@", pos)) != -1:
+        match = _BLOCK_START_RE.match(text, at)
+        if match is None:
+            raise ValueError(f"'@' at offset {at} does not start a block")
+        end = _match_brace(text, match.end() - 1)
+        if end is None:
+            raise ValueError(f"unbalanced braces in block at offset {at}")
+        yield match.group(1).lower(), at, end + 1
+        pos = end + 1
+
+
+def count_raw_entries(text: str) -> int:
+    """Count entry blocks via iter_raw_blocks(); raises ValueError like it does."""
+    return sum(1 for kind, _, _ in iter_raw_blocks(text) if kind not in NON_ENTRY_BLOCK_TYPES)
+
+
+def find_raw_entry(data: bytes, key: str) -> tuple[int, int] | None:
+    """Return (start, end) of the first "@type{key," block in data, or None.
+
+    Only the matching block is brace-scanned, so a lookup stops at the entry
+    instead of walking the whole file. The block must start a line; None means
+    it was not found or its braces do not balance, and callers should fall back
+    to parse_bib_text().
+    """
+    start_re = re.compile(
+        rb"^[ \t]*(@)[ \t]*[A-Za-z]\w*[ \t]*\{\s*" + re.escape(key.encode("utf-8")) + rb"\s*,",
+        re.MULTILINE,
+    )
+    match = start_re.search(data)
+    if match is None:
+        return None
+    depth = 0
+    for token in _BRACE_TOKEN_BYTES_RE.finditer(data, match.start(1)):
+        char = token.group()
+        if char == b"{":
+            depth += 1
+        elif char == b"}":
+            depth -= 1
+            if depth == 0:
+                return match.start(1), token.end()
+    return None
+
+
+def build_raw_block_index(data: bytes) -> RawBlockIndex:
+    """Index entry blocks of raw file bytes by key; raises ValueError like iter_raw_blocks().
+
+    Scanning the latin-1 view keeps offsets in bytes: "@", braces and the other
+    structural characters are ASCII and never occur inside UTF-8 sequences.
+    """
+    text = data.decode("latin-1")
+    entry_count = 0
+    spans: dict[str, tuple[int, int]] = {}
+    for kind, start, end in iter_raw_blocks(text):
+        if kind in NON_ENTRY_BLOCK_TYPES:
+            continue
+        entry_count += 1
+        match = _BLOCK_KEY_RE.match(text, start)
+        if match is not None:
+            key = match.group(1).encode("latin-1").decode("utf-8", errors="replace")
+            spans.setdefault(key, (start, end))
+    return RawBlockIndex(entry_count=entry_count, spans=spans)
+
+
+def raw_block_index(path: Path, cache_dir: Path | None = None) -> RawBlockIndex:
+    """build_raw_block_index() for a file, memoized on disk by path, mtime and size.
+
+    Lets separate scripts (and runs) that count or look up entries in the same
+    unchanged file share one scan. The cache lives in the per-user cache dir and
+    keeps the BLOCK_INDEX_CACHE_LIMIT most recently used indexes. Raises
+    OSError/ValueError like a fresh build.
+    """
+    stat = path.stat()
+    ident = f"{_BLOCK_INDEX_VERSION}\0{path.resolve()}\0{stat.st_mtime_ns}\0{stat.st_size}"
+    digest = hashlib.blake2b(ident.encode("utf-8"), digest_size=16).hexdigest()
+    cache_dir = cache_dir or BLOCK_INDEX_CACHE_DIR
+    cache_path = cache_dir / f"{digest}.pkl"
+    try:
+        with open(cache_path, "rb") as f:
+            index = pickle.load(f)
+        # Refresh the mtime so eviction drops the least recently used
+        cache_path.touch()
+        return index
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+
+    index = build_raw_block_index(path.read_bytes())
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix(f".{uuid.uuid4().hex[:10]}.tmp")
+        with open(temp_path, "wb") as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        temp_path.replace(cache_path)
+        _evict_block_indexes(cache_dir)
+    except OSError:
+        pass
+    return index
+
+
+def _evict_block_indexes(cache_dir: Path) -> None:
+    cached = []
+    for cache_path in cache_dir.glob("*.pkl"):
+        try:
+            cached.append((cache_path.stat().st_mtime_ns, cache_path))
+        except OSError:
+            continue
+    if len(cached) <= BLOCK_INDEX_CACHE_LIMIT:
+        return
+    cached.sort()
+    for _, cache_path in cached[: len(cached) - BLOCK_INDEX_CACHE_LIMIT]:
+        cache_path.unlink(missing_ok=True)
+
+
 def make_bib_database(
     entries: list[dict[str, Any]] | None = None,
     *,
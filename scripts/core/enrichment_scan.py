@@ -0,0 +1,38 @@
+"""Detect enrichment indicators in BibTeX entry text."""
+
+from __future__ import annotations
+
+import mmap
+import re
+
+# An openalex = {<id>} field, or any bare enrichment indicator
+_ENRICHMENT_PATTERN = r"openalex\s*=\s*\{([^}]+)\}|openalex|pdf|abstract"
+ENRICHMENT_RE = re.compile(_ENRICHMENT_PATTERN, re.IGNORECASE)
+# Same pattern for bytes, so files can be scanned through mmap without decoding
+ENRICHMENT_BYTES_RE = re.compile(_ENRICHMENT_PATTERN.encode("ascii"), re.IGNORECASE)
+
+
+def scan_enrichment(content: str | bytes | mmap.mmap) -> tuple[bool, str | None]:
+    """Return (has enrichment indicators, OpenAlex ID) from one pass over content."""
+    pattern = ENRICHMENT_RE if isinstance(content, str) else ENRICHMENT_BYTES_RE
+    is_enriched = False
+    for match in pattern.finditer(content):
+        is_enriched = True
+        openalex_id = match.group(1)
+        if openalex_id:
+            if isinstance(openalex_id, bytes):
+                openalex_id = openalex_id.decode("utf-8", errors="replace")
+            return True, openalex_id
+    return is_enriched, None
+
+
+def scan_enrichment_file(path: str) -> tuple[bool, str | None]:
+    """Run scan_enrichment() over a read-only mapping of the file."""
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return False, None
+        with mm:
+            return scan_enrichment(mm)
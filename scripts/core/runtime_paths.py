@@ -6,6 +6,7 @@ import os
 from pathlib import Path
 
 RUNTIME_DIR_ENV = "BIBOPS_RUNTIME_DIR"
+CACHE_DIR_ENV = "XDG_CACHE_HOME"
 
 
 def bibops_runtime_dir() -> Path:
@@ -17,3 +18,14 @@ def bibops_runtime_dir() -> Path:
 
 def bibops_runtime_path(*parts: str) -> Path:
     return bibops_runtime_dir().joinpath(*parts)
+
+
+def bibops_cache_dir() -> Path:
+    """Per-user cache directory, kept outside the repository working tree."""
+    value = os.environ.get(CACHE_DIR_ENV, "").strip()
+    base = Path(value) if value else Path.home() / ".cache"
+    return base / "bibops"
+
+
+def bibops_cache_path(*parts: str) -> Path:
+    return bibops_cache_dir().joinpath(*parts)
@@ -7,54 +7,79 @@ Now with optional enrichment statistics.
 
 import argparse
 import re
+import sqlite3
 import sys
 from pathlib import Path
 
+from core.bibtex_io import count_raw_entries
+
+# A line whose first non-blank character is "@", unless it opens an
+# @string/@preamble/@comment block
+ENTRY_LINE_RE = re.compile(
+    rb"^[ \t\r\v\f]*@(?!(?:string|preamble|comment)[ \t\r\v\f]*\{)",
+    re.MULTILINE | re.IGNORECASE,
+)
+
+# latest_enrichment_status is a view and cannot be indexed; the same latest
+# row per key is read from enrichment_log, which idx_latest_status_lookup
+# (init-tracking-db.py) covers, so no table rows or DISTINCT sort are needed
+_SQL_ENRICHED_COUNT = """
+    SELECT COUNT(*) FROM (
+        SELECT status, MAX(timestamp)
+        FROM enrichment_log
+        WHERE file_path = ?
+        GROUP BY entry_key
+    )
+    WHERE status = 'success'
+"""
+
+# Shared read-only connection, opened on first use
+_CONN: sqlite3.Connection | None = None
+
+
+def _conn() -> sqlite3.Connection:
+    """Return the shared read-only connection to bibliography.db."""
+    global _CONN
+    if _CONN is None:
+        # mode=ro fails instead of creating an empty database file
+        conn = sqlite3.connect("file:bibliography.db?mode=ro", uri=True)
+        conn.execute("PRAGMA query_only=1")
+        _CONN = conn
+    return _CONN
+
+
+def count_entry_lines(data: bytes) -> int:
+    """Heuristic count: lines opening a block that is not @string/@preamble/@comment."""
+    return sum(1 for _ in ENTRY_LINE_RE.finditer(data))
+
 
 def count_entries(filepath: str | Path) -> int:
     """Count valid BibTeX entries in the file."""
-    count = 0
-    skip_patterns = [r"^@string\s*{", r"^@preamble\s*{", r"^@comment\s*{"]
-
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith("@") and not any(
-                    re.match(pattern, line, re.IGNORECASE) for pattern in skip_patterns
-                ):
-                    count += 1
+        with open(filepath, "rb") as f:
+            data = f.read()
     except Exception as e:
         print(f"Error reading file: {e}", file=sys.stderr)
         return 0
 
-    return count
+    # Walk the top-level blocks so "@" lines inside field values are not
+    # counted; stray "@"s or unbalanced braces fall back to the line heuristic
+    try:
+        return count_raw_entries(data.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return count_entry_lines(data)
 
 
 def count_enriched_entries(filepath: str | Path) -> int:
     """Count entries that have been successfully enriched according to the database."""
-    import sqlite3
-
-    db_path = "bibliography.db"
-    if not Path(db_path).exists():
-        return 0  # No database means nothing has been enriched
-
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT COUNT(DISTINCT entry_key) 
-            FROM latest_enrichment_status 
-            WHERE file_path = ? AND latest_status = 'success'
-        """,
-            (str(filepath),),
-        )
-        result = cursor.fetchone()
-        conn.close()
+        # Repeated calls reuse the connection and sqlite3's cached statement
+        result = _conn().execute(_SQL_ENRICHED_COUNT, (str(filepath),)).fetchone()
         return result[0] if result else 0
-    except Exception:
-        return 0  # If database query fails, assume nothing is enriched
+    except sqlite3.Error:
+        # No database means nothing has been enriched; a failed query
+        # is treated the same way
+        return 0
 
 
 def main() -> None:
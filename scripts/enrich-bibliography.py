@@ -20,16 +20,108 @@ Usage:
 """
 
 import argparse
+import contextlib
+import functools
+import importlib.util
+import io
 import json
+import mmap
+import os
+import re
 import shutil
-import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional
+
+from core.bibtex_io import parse_bib_file, raw_block_index
+
+try:
+    import orjson
+except ModuleNotFoundError:  # optional speedup; stdlib json is used without it
+    orjson = None
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Tracking database, relative to the working directory like the other scripts
+DB_PATH = Path("bibliography.db")
+# Backup suffix as a strftime format, e.g. ".bak.20250101_120000"
+BACKUP_SUFFIX_FORMAT = ".bak.%Y%m%d_%H%M%S"
+
+# Message prefix per log level
+LOG_PREFIXES = {
+    "info": "ℹ️ ",
+    "success": "✓ ",
+    "warning": "⚠️ ",
+    "error": "✗ ",
+    "progress": "🔄 ",
+    "debug": "🔍 ",
+}
+
+# Per-entry files written by analyze-enrichment.py into the temp directory
+ENTRY_FILE_RE = re.compile(r"entry-([1-9]\d*)\.bib")
+AT_LINE_RE = re.compile(rb"^@", re.MULTILINE)
+
+# How long to wait for a batch's completion sentinel before moving on, and
+# the bounds of the polling backoff
+BATCH_WAIT_SECONDS = 2.0
+POLL_MIN_SECONDS = 0.01
+POLL_MAX_SECONDS = 0.5
+
+
+def count_at_lines(path: Path) -> int:
+    """Count lines starting with "@" in one in-process scan of the file."""
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return 0
+        with mm:
+            return sum(1 for _ in AT_LINE_RE.finditer(mm))
+
+
+@functools.cache
+def load_script(name: str) -> ModuleType:
+    """Import a sibling script such as "analyze-enrichment" once per process."""
+    spec = importlib.util.spec_from_file_location(
+        name.replace("-", "_"), SCRIPTS_DIR / f"{name}.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def loads_json(data: str | bytes) -> Any:
+    """Decode JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
-from core.bibtex_io import parse_bib_file
+def read_batch_file(batch_file: str) -> Dict[str, Any]:
+    """Load one batch manifest written by analyze-enrichment.py."""
+    return loads_json(Path(batch_file).read_bytes())
+
+
+def wait_for_file(path: Path, timeout: float) -> bool:
+    """Poll for path to appear with exponential backoff; False on timeout."""
+    deadline = time.monotonic() + timeout
+    delay = POLL_MIN_SECONDS
+    while True:
+        try:
+            os.stat(path)
+            return True
+        except FileNotFoundError:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, POLL_MAX_SECONDS)
 
 
 class EnrichmentOrchestrator:
@@ -64,27 +156,32 @@ class EnrichmentOrchestrator:
         self.backup_path: Optional[Path] = None
         self.temp_dir: Optional[Path] = None
         self.enriched_file: Optional[Path] = None
+        self._enriched_path = file_path.with_suffix(".enriched")
+
+        # One bound method per level, resolved once instead of on every call
+        self.log_info = self._make_logger("info")
+        self.log_success = self._make_logger("success")
+        self.log_warning = self._make_logger("warning")
+        self.log_error = self._make_logger("error")
+        self.log_progress = self._make_logger("progress")
+        self.log_debug = self._make_logger("debug")
+
+    def _make_logger(self, level: str) -> Callable[[str], None]:
+        """Build the log method for one level; debug is a no-op unless verbose."""
+        if level == "debug" and not self.verbose:
+            return lambda message: None
 
-    def log(self, message: str, level: str = "info") -> None:
-        """Log a message with appropriate formatting."""
-        prefix = {
-            "info": "ℹ️ ",
-            "success": "✓ ",
-            "warning": "⚠️ ",
-            "error": "✗ ",
-            "progress": "🔄 ",
-            "debug": "🔍 ",
-        }.get(level, "")
+        prefix = LOG_PREFIXES[level]
 
-        if level == "debug" and not self.verbose:
-            return
+        def log(message: str) -> None:
+            sys.stdout.write(f"{prefix}{message}\n")
 
-        print(f"{prefix}{message}")
+        return log
 
     def run(self) -> bool:
         """Run the complete enrichment workflow."""
         try:
-            self.log(f"Starting enrichment workflow for {self.file_path}")
+            self.log_info(f"Starting enrichment workflow for {self.file_path}")
 
             # Validate only mode
             if self.validate_only:
@@ -99,40 +196,39 @@ class EnrichmentOrchestrator:
                 self._create_backup()
 
             # Step 3: Analyze file
-            self.log("Analyzing file for enrichment status...", "progress")
+            self.log_progress("Analyzing file for enrichment status...")
             analysis = self._analyze_file()
             if not analysis:
                 return False
 
             # Step 4: Check if enrichment needed
             if analysis["unenriched_entries"] == 0 and not self.retry_failed:
-                self.log("All entries are already enriched!", "success")
+                self.log_success("All entries are already enriched!")
                 return True
 
             # Step 5: Process batches
             if not self.dry_run:
-                self.log(
+                self.log_progress(
                     f"Processing {analysis['unenriched_entries']} unenriched entries...",
-                    "progress",
                 )
                 if not self._process_batches(analysis):
                     return False
 
             # Step 6: Reassemble file
             if not self.dry_run:
-                self.log("Reassembling enriched file...", "progress")
+                self.log_progress("Reassembling enriched file...")
                 if not self._reassemble_file(analysis):
                     return False
 
             # Step 7: Validate results
             if not self.dry_run:
-                self.log("Validating enriched file...", "progress")
+                self.log_progress("Validating enriched file...")
                 if not self._validate_results():
                     return False
 
             # Step 8: Replace original
             if not self.dry_run:
-                self.log("Replacing original file with enriched version...", "progress")
+                self.log_progress("Replacing original file with enriched version...")
                 if not self._replace_original():
                     return False
 
@@ -141,11 +237,11 @@ class EnrichmentOrchestrator:
             return True
 
         except KeyboardInterrupt:
-            self.log("Workflow interrupted by user", "error")
+            self.log_error("Workflow interrupted by user")
             self._cleanup(restore_backup=True)
             return False
         except Exception as e:
-            self.log(f"Unexpected error: {e}", "error")
+            self.log_error(f"Unexpected error: {e}")
             self._cleanup(restore_backup=True)
             return False
 
@@ -153,59 +249,55 @@ class EnrichmentOrchestrator:
         """Perform initial checks before starting."""
         # Check file exists
         if not self.file_path.exists():
-            self.log(f"File not found: {self.file_path}", "error")
+            self.log_error(f"File not found: {self.file_path}")
             return False
 
         # Check database exists
-        if not Path("bibliography.db").exists():
-            self.log("Initializing tracking database...", "info")
+        if not DB_PATH.exists():
+            self.log_info("Initializing tracking database...")
             try:
-                subprocess.run(
-                    ["python3", "scripts/init-tracking-db.py"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                self.log("Database initialized successfully", "success")
-            except subprocess.CalledProcessError as e:
-                self.log(f"Failed to initialize database: {e.stderr}", "error")
+                load_script("init-tracking-db").init_database(str(DB_PATH))
+                self.log_success("Database initialized successfully")
+            except Exception as e:
+                self.log_error(f"Failed to initialize database: {e}")
                 return False
 
-        # Parse file to get initial count
+        # Count entry blocks for the initial figure (shared with other scripts
+        # through the on-disk block index); only text the block scanner cannot
+        # follow pays for a full parse
         try:
-            bib_db = parse_bib_file(self.file_path)
-            self.original_count = len(bib_db.entries)
-            self.log(f"Found {self.original_count} entries in {self.file_path}", "info")
+            try:
+                self.original_count = raw_block_index(self.file_path).entry_count
+            except ValueError:
+                self.original_count = len(parse_bib_file(self.file_path).entries)
+            self.log_info(f"Found {self.original_count} entries in {self.file_path}")
         except Exception as e:
-            self.log(f"Error parsing BibTeX file: {e}", "error")
+            self.log_error(f"Error parsing BibTeX file: {e}")
             return False
 
         return True
 
     def _create_backup(self) -> None:
         """Create a backup of the original file."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.backup_path = self.file_path.with_suffix(f".bak.{timestamp}")
+        self.backup_path = self.file_path.with_suffix(
+            datetime.now().strftime(BACKUP_SUFFIX_FORMAT)
+        )
         shutil.copy2(self.file_path, self.backup_path)
-        self.log(f"Created backup: {self.backup_path}", "success")
+        self.log_success(f"Created backup: {self.backup_path}")
 
     def _analyze_file(self) -> Optional[Dict[str, Any]]:
         """Analyze the file for enrichment status."""
         try:
-            result = subprocess.run(
-                ["python3", "scripts/analyze-enrichment.py", str(self.file_path)],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            analysis = json.loads(result.stdout)
+            analysis, code = load_script("analyze-enrichment").analyze(self.file_path)
+            if code != 0:
+                self.log_error(f"Analysis failed: {analysis.get('message', '')}")
+                return None
 
             self.enriched_count = analysis.get("enriched_entries", 0)
             self.unenriched_count = analysis.get("unenriched_entries", 0)
 
-            self.log(
+            self.log_info(
                 f"Analysis complete: {self.enriched_count} enriched, {self.unenriched_count} unenriched",
-                "info",
             )
 
             # Store temp directory
@@ -214,210 +306,194 @@ class EnrichmentOrchestrator:
 
             return analysis
 
-        except subprocess.CalledProcessError as e:
-            self.log(f"Analysis failed: {e.stderr}", "error")
-            return None
-        except json.JSONDecodeError as e:
-            self.log(f"Failed to parse analysis output: {e}", "error")
+        except Exception as e:
+            self.log_error(f"Analysis failed: {e}")
             return None
 
     def _process_batches(self, analysis: Dict[str, Any]) -> bool:
         """Process enrichment batches."""
         batch_files = analysis.get("batch_files", [])
         if not batch_files:
-            self.log("No batches to process", "warning")
+            self.log_warning("No batches to process")
             return True
 
         # Limit batches if requested
         if self.max_batches:
             batch_files = batch_files[: self.max_batches]
-            self.log(f"Processing first {self.max_batches} batches only", "info")
+            self.log_info(f"Processing first {self.max_batches} batches only")
 
         total_batches = len(batch_files)
-        self.log(f"Processing {total_batches} batch(es)...", "progress")
-
-        # Process each batch
-        for i, batch_file in enumerate(batch_files, 1):
-            self.log(
-                f"\nProcessing batch {i}/{total_batches}: {Path(batch_file).name}",
-                "progress",
-            )
-
-            # Print enrichment markers for Claude to handle
-            with open(batch_file, "r") as f:
-                batch_data = json.load(f)
+        self.log_progress(f"Processing {total_batches} batch(es)...")
+
+        # Process each batch; manifests are read ahead on worker threads while
+        # markers are still emitted and waited on in batch order
+        with ThreadPoolExecutor(max_workers=min(8, total_batches)) as executor:
+            batches = executor.map(read_batch_file, batch_files)
+            for i, (batch_file, batch_data) in enumerate(zip(batch_files, batches), 1):
+                batch_path = Path(batch_file)
+                self.log_progress(
+                    f"\nProcessing batch {i}/{total_batches}: {batch_path.name}"
+                )
 
-            entries = batch_data.get("entries", [])
-            for entry in entries:
-                entry_file = entry.get("file")
-                if entry_file:
-                    print(f"ENRICHMENT_REQUIRED: {entry_file}")
+                # Print enrichment markers for Claude to handle
+                entries = batch_data.get("entries", [])
+                for entry in entries:
+                    entry_file = entry.get("file")
+                    if entry_file:
+                        print(f"ENRICHMENT_REQUIRED: {entry_file}")
 
-            # Wait for enrichment to complete
-            self.log(f"Waiting for batch {i} enrichment to complete...", "debug")
-            time.sleep(2)  # Give Claude time to process
+                # Wait for enrichment to complete: the agent touches batch-<i>.done
+                # when finished; without it, fall back to the old fixed grace period
+                self.log_debug(f"Waiting for batch {i} enrichment to complete...")
+                sentinel = batch_path.with_suffix(".done")
+                if wait_for_file(sentinel, BATCH_WAIT_SECONDS):
+                    self.log_debug(f"Batch {i} reported complete")
 
         return True
 
     def _reassemble_file(self, analysis: Dict[str, Any]) -> bool:
         """Reassemble the enriched file from individual entries."""
         if not self.temp_dir:
-            self.log("No temporary directory found", "error")
+            self.log_error("No temporary directory found")
             return False
 
         total_entries = analysis.get("total_entries", 0)
 
         # Create enriched file path
-        self.enriched_file = self.file_path.with_suffix(".enriched")
+        self.enriched_file = self._enriched_path
 
-        self.log(f"Reassembling {total_entries} entries...", "debug")
-
-        # Use the sequential loop method for reassembly
-        reassembly_cmd = (
-            f"for i in $(seq 1 {total_entries}); do "
-            f'[ -f "{self.temp_dir}/entry-$i.bib" ] && '
-            f'cat "{self.temp_dir}/entry-$i.bib" && echo; '
-            f'done > "{self.enriched_file}"'
-        )
+        self.log_debug(f"Reassembling {total_entries} entries...")
 
         try:
-            result = subprocess.run(
-                ["bash", "-c", reassembly_cmd],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
+            # One directory read instead of probing every index; entry-1.bib ..
+            # entry-N.bib that exist are concatenated in order, each followed
+            # by a newline
+            with os.scandir(self.temp_dir) as it:
+                entry_paths = sorted(
+                    (index, item.path)
+                    for item in it
+                    if (match := ENTRY_FILE_RE.fullmatch(item.name))
+                    and (index := int(match.group(1))) <= total_entries
+                )
+
+            with open(self.enriched_file, "wb") as dst:
+                for _, entry_path in entry_paths:
+                    with open(entry_path, "rb") as src:
+                        shutil.copyfileobj(src, dst, 1 << 20)
+                    dst.write(b"\n")
 
             # Verify reassembled file
             if not self.enriched_file.exists():
-                self.log("Reassembled file not created", "error")
+                self.log_error("Reassembled file not created")
                 return False
 
-            # Count entries in reassembled file
-            result = subprocess.run(
-                ["grep", "-c", "^@", str(self.enriched_file)],
-                capture_output=True,
-                text=True,
-            )
-            reassembled_count = int(result.stdout.strip())
+            # Count lines starting with "@" (what `grep -c "^@"` reported)
+            reassembled_count = count_at_lines(self.enriched_file)
 
             if reassembled_count != total_entries:
-                self.log(
+                self.log_error(
                     f"Entry count mismatch: expected {total_entries}, got {reassembled_count}",
-                    "error",
                 )
                 return False
 
-            self.log(f"Successfully reassembled {reassembled_count} entries", "success")
+            self.log_success(f"Successfully reassembled {reassembled_count} entries")
             return True
 
-        except subprocess.CalledProcessError as e:
-            self.log(f"Reassembly failed: {e.stderr}", "error")
-            return False
         except Exception as e:
-            self.log(f"Error during reassembly: {e}", "error")
+            self.log_error(f"Error during reassembly: {e}")
             return False
 
     def _validate_results(self) -> bool:
         """Validate the enriched file."""
         if not self.enriched_file or not self.enriched_file.exists():
-            self.log("No enriched file to validate", "error")
+            self.log_error("No enriched file to validate")
             return False
 
         try:
-            # Run validation
-            result = subprocess.run(
-                [
-                    "python3",
-                    "scripts/validate-enrichment.py",
-                    str(self.enriched_file),
-                    "--no-pdf-check",  # Skip PDF checks for speed
-                    "--summary",
-                ],
-                capture_output=True,
-                text=True,
-            )
+            # Run validation, capturing its report to indent it below
+            output_buffer = io.StringIO()
+            with contextlib.redirect_stdout(output_buffer):
+                returncode = load_script("validate-enrichment").main(
+                    [
+                        str(self.enriched_file),
+                        "--no-pdf-check",  # Skip PDF checks for speed
+                        "--summary",
+                    ]
+                )
 
             # Parse validation results
-            output = result.stdout
-            self.log("Validation results:", "info")
+            output = output_buffer.getvalue()
+            self.log_info("Validation results:")
             for line in output.strip().split("\n"):
                 if line.strip():
                     print(f"  {line}")
 
             # Check exit code
-            if result.returncode == 0:
-                self.log("Validation passed!", "success")
+            if returncode == 0:
+                self.log_success("Validation passed!")
                 return True
             else:
-                self.log("Validation failed - check results above", "error")
+                self.log_error("Validation failed - check results above")
                 return False
 
-        except subprocess.CalledProcessError as e:
-            self.log(f"Validation error: {e.stderr}", "error")
+        except Exception as e:
+            self.log_error(f"Validation error: {e}")
             return False
 
     def _replace_original(self) -> bool:
         """Replace the original file with the enriched version."""
         if not self.enriched_file or not self.enriched_file.exists():
-            self.log("No enriched file to use for replacement", "error")
+            self.log_error("No enriched file to use for replacement")
             return False
 
         try:
             # Move enriched file to original location
             shutil.move(str(self.enriched_file), str(self.file_path))
-            self.log(
+            self.log_success(
                 f"Successfully replaced {self.file_path} with enriched version",
-                "success",
             )
             return True
 
         except Exception as e:
-            self.log(f"Failed to replace original file: {e}", "error")
+            self.log_error(f"Failed to replace original file: {e}")
             return False
 
     def _run_validation_only(self) -> bool:
         """Run validation on the existing file."""
-        self.log(f"Running validation on {self.file_path}...", "progress")
+        self.log_progress(f"Running validation on {self.file_path}...")
 
         try:
-            result = subprocess.run(
-                ["python3", "scripts/validate-enrichment.py", str(self.file_path)],
-                capture_output=True,
-                text=True,
-            )
+            returncode = load_script("validate-enrichment").main([str(self.file_path)])
 
-            print(result.stdout)
-
-            if result.returncode == 0:
-                self.log("Validation passed!", "success")
+            if returncode == 0:
+                self.log_success("Validation passed!")
                 return True
             else:
-                self.log("Validation failed", "error")
+                self.log_error("Validation failed")
                 return False
 
-        except subprocess.CalledProcessError as e:
-            self.log(f"Validation error: {e.stderr}", "error")
+        except Exception as e:
+            self.log_error(f"Validation error: {e}")
             return False
 
     def _cleanup(self, restore_backup: bool = False) -> None:
         """Clean up temporary files and optionally restore backup."""
         # Restore backup if requested and available
         if restore_backup and self.backup_path and self.backup_path.exists():
-            self.log("Restoring backup due to error...", "warning")
+            self.log_warning("Restoring backup due to error...")
             try:
                 shutil.copy2(self.backup_path, self.file_path)
-                self.log("Backup restored successfully", "success")
+                self.log_success("Backup restored successfully")
             except Exception as e:
-                self.log(f"Failed to restore backup: {e}", "error")
+                self.log_error(f"Failed to restore backup: {e}")
 
         # Clean up temporary directory
         if self.temp_dir and self.temp_dir.exists():
             try:
                 shutil.rmtree(self.temp_dir)
-                self.log("Cleaned up temporary files", "debug")
+                self.log_debug("Cleaned up temporary files")
             except Exception as e:
-                self.log(f"Failed to clean up temp directory: {e}", "warning")
+                self.log_warning(f"Failed to clean up temp directory: {e}")
 
         # Clean up enriched file if exists
         if self.enriched_file and self.enriched_file.exists():
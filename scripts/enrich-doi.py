@@ -538,7 +538,7 @@ def iter_file_paths(patterns: list[str]) -> list[Path]:
             if p.exists():
                 matches = [p]
         for p in matches:
-            if p.is_file() and p.suffix.lower() == ".bib":
+            if p.suffix.lower() == ".bib" and p.is_file():
                 rp = p.resolve()
                 if rp not in seen:
                     out.append(p)
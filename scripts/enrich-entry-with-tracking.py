@@ -13,17 +13,35 @@ Usage: enrich-entry-with-tracking.py <target_file> <entry_key>
 """
 
 import json
-import re
+import mmap
 import subprocess
 import sys
 import tempfile
 from pathlib import Path
 
-from core.bibtex_io import make_bib_database, parse_bib_file, render_bib_database
+from core.bibtex_io import (
+    find_raw_entry,
+    make_bib_database,
+    parse_bib_file,
+    render_bib_database,
+)
+from core.enrichment_scan import scan_enrichment_file
 
 
 def extract_entry_by_key(file_path: str, entry_key: str) -> str | None:
     """Extract a single entry from a BibTeX file by its key."""
+    # Copy the entry's bytes verbatim when it can be located without a parse
+    try:
+        with open(file_path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            span = find_raw_entry(mm, entry_key)
+            if span is not None:
+                return mm[span[0] : span[1]].decode("utf-8") + "\n"
+    except (OSError, ValueError):
+        # ValueError: empty file (mmap) or invalid UTF-8; let the parser decide
+        pass
+
     try:
         bib_db = parse_bib_file(Path(file_path))
 
@@ -38,19 +56,6 @@ def extract_entry_by_key(file_path: str, entry_key: str) -> str | None:
         return None
 
 
-def extract_openalex_id(content: str) -> str | None:
-    """Extract OpenAlex ID from BibTeX content."""
-    match = re.search(r"openalex\s*=\s*\{([^}]+)\}", content, re.IGNORECASE)
-    return match.group(1) if match else None
-
-
-def check_enrichment(content: str) -> bool:
-    """Check if entry has enrichment indicators."""
-    indicators = ["openalex", "pdf", "abstract"]
-    content_lower = content.lower()
-    return any(indicator in content_lower for indicator in indicators)
-
-
 def run_enrichment_agent(file_path: str) -> tuple[bool, str]:
     """
     Run the bibtex-entry-enricher agent on a file.
@@ -165,13 +170,8 @@ def main() -> None:
         print("2. Look for openalex field")
         print("3. Verify PDF links added")
 
-        # Read back the result (in automated flow)
-        with open(tmp_path, "r", encoding="utf-8") as f:
-            enriched_content = f.read()
-
-        # Check if enriched
-        is_enriched = check_enrichment(enriched_content)
-        openalex_id = extract_openalex_id(enriched_content) if is_enriched else None
+        # Check the result (in automated flow) straight from the file
+        is_enriched, openalex_id = scan_enrichment_file(tmp_path)
 
         # Track the result
         if is_enriched:
@@ -5,50 +5,139 @@ Automated single-entry enrichment with tracking.
 This script is designed to be called from within Claude Code's environment
 where it can programmatically invoke the bibtex-entry-enricher agent.
 
-Usage: enrich-single-entry.py <target_file> <entry_key>
+Usage: enrich-single-entry.py <target_file> <entry_key> [entry_key ...]
+       enrich-single-entry.py <target_file> --stdin
+
+Several keys may be given so the target file is indexed once per batch. With
+--stdin the script stays running and reads one entry key per line, which lets
+a caller keep a pool of warm workers. In both modes each entry's output is
+followed by an "ENTRY_STATUS: <key> <code>" line, preceded by a
+"TRACKING_FAILED: <key>" line if the result could not be recorded, and the
+process exits with the worst per-entry code.
 
 Returns:
   0 - Success (entry enriched and tracked)
-  1 - Failure (enrichment failed or entry not found)
+  1 - Failure (enrichment failed, entry not found or result not tracked)
   2 - Partial success (enrichment ran but no indicators found)
 """
 
-import re
-import subprocess
+import contextlib
+import functools
+import importlib.util
+import mmap
+import os
 import sys
 import tempfile
+from collections.abc import Iterable
 from pathlib import Path
+from typing import Any
+
+from core.bibtex_io import (
+    find_raw_entry,
+    make_bib_database,
+    parse_bib_entries,
+    raw_block_index,
+    render_bib_database,
+)
+from core.enrichment_scan import scan_enrichment
+
+
+STATUS_PREFIX = "ENTRY_STATUS:"
 
-from core.bibtex_io import make_bib_database, parse_bib_file, render_bib_database
+# Printed before an entry's status line when its result was not tracked
+TRACKING_FAILED_PREFIX = "TRACKING_FAILED:"
 
+_TRACKER: Any = None
 
-def extract_entry_by_key(file_path: str, entry_key: str) -> str | None:
-    """Extract a single entry from a BibTeX file by its key."""
+# Results that could not be written to the tracking database
+_TRACKING_FAILURES = 0
+
+
+def block_spans(file_path: str) -> dict[str, tuple[int, int]]:
+    """Map entry keys to byte spans from the shared block index ({} if unavailable)."""
     try:
-        bib_db = parse_bib_file(Path(file_path))
+        return raw_block_index(Path(file_path)).spans
+    except (OSError, ValueError):
+        # ValueError: unbalanced blocks; callers fall back to the scans below
+        return {}
 
-        for entry in bib_db.entries:
-            if entry.get("ID") == entry_key:
-                temp_db = make_bib_database(entries=[entry])
-                return render_bib_database(temp_db)
 
-        return None
+def extract_entry_by_key(
+    file_path: str,
+    entry_key: str,
+    spans: dict[str, tuple[int, int]] | None = None,
+) -> str | None:
+    """Extract a single entry from a BibTeX file by its key.
+
+    Pass spans from block_spans() to reuse one index lookup for many keys.
+    """
+    # Read just the entry's bytes when the shared block index knows its span
+    if spans is None:
+        spans = block_spans(file_path)
+    span = spans.get(entry_key)
+    if span is not None:
+        try:
+            with open(file_path, "rb") as f:
+                f.seek(span[0])
+                return f.read(span[1] - span[0]).decode("utf-8") + "\n"
+        except (OSError, ValueError):
+            # ValueError: invalid UTF-8; try the scans below
+            pass
+
+    # Copy the entry's bytes verbatim when it can be located without a parse
+    try:
+        with open(file_path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            span = find_raw_entry(mm, entry_key)
+            if span is not None:
+                return mm[span[0] : span[1]].decode("utf-8") + "\n"
+    except (OSError, ValueError):
+        # ValueError: empty file (mmap) or invalid UTF-8; let the parser decide
+        pass
+
+    entry = index_entries(file_path).get(entry_key)
+    return render_entry(entry) if entry is not None else None
+
+
+def index_entries(file_path: str) -> dict[str, Any]:
+    """Map each key to its first entry, reusing the parse while the file is unchanged."""
+    try:
+        return _indexed_entries(file_path, os.stat(file_path).st_mtime_ns)
     except Exception as e:
         print(f"Error parsing BibTeX file: {e}", file=sys.stderr)
-        return None
+        return {}
+
+
+@functools.lru_cache(maxsize=4)
+def _indexed_entries(file_path: str, mtime_ns: int) -> dict[str, Any]:
+    """Parse a BibTeX file once and map each key to its first entry."""
+    entries: dict[str, Any] = {}
+    for entry in parse_bib_entries(Path(file_path)):
+        entries.setdefault(entry.get("ID"), entry)
+    return entries
 
 
-def extract_openalex_id(content: str) -> str | None:
-    """Extract OpenAlex ID from BibTeX content."""
-    match = re.search(r"openalex\s*=\s*\{([^}]+)\}", content, re.IGNORECASE)
-    return match.group(1) if match else None
+def render_entry(entry: Any) -> str:
+    """Render a single parsed entry back to BibTeX text."""
+    return render_bib_database(make_bib_database(entries=[entry]))
 
 
-def check_enrichment(content: str) -> bool:
-    """Check if entry has enrichment indicators."""
-    indicators = ["openalex", "pdf", "abstract"]
-    content_lower = content.lower()
-    return any(indicator in content_lower for indicator in indicators)
+def load_tracker() -> None:
+    """Create the shared EnrichmentTracker from track-enrichment.py."""
+    global _TRACKER
+    spec = importlib.util.spec_from_file_location(
+        "track_enrichment", Path(__file__).resolve().parent / "track-enrichment.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _TRACKER = module.EnrichmentTracker()
+
+
+def close_tracker() -> None:
+    """Close the tracking database connection."""
+    if _TRACKER is not None:
+        _TRACKER.close()
 
 
 def track_enrichment(
@@ -58,55 +147,41 @@ def track_enrichment(
     openalex_id: str | None = None,
     error_msg: str | None = None,
 ) -> None:
-    """Track the enrichment result using the track-enrichment.py script."""
-    cmd = [
-        sys.executable,
-        "scripts/track-enrichment.py",
-        file_path,
-        entry_key,
-        "success" if success else "failed",
-    ]
-    if openalex_id:
-        cmd.append(openalex_id)
-    if error_msg:
-        cmd.append(error_msg)
-
+    """Record the enrichment result in-process, committing it before returning."""
+    global _TRACKING_FAILURES
+    if _TRACKER is None:
+        load_tracker()
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        if result.stdout:
-            print(result.stdout.strip())
-    except subprocess.CalledProcessError as e:
-        print(f"Error tracking enrichment: {e.stderr}", file=sys.stderr)
-
-
-def main() -> None:
-    if len(sys.argv) != 3:
-        print(
-            "Usage: enrich-single-entry.py <target_file> <entry_key>", file=sys.stderr
-        )
-        print(
-            "\nThis script enriches a single entry and tracks the result.",
-            file=sys.stderr,
+        _TRACKER.record(
+            file_path,
+            entry_key,
+            "success" if success else "failed",
+            openalex_id,
+            error_msg,
         )
-        print("Designed to be called from Claude Code environment.", file=sys.stderr)
-        sys.exit(1)
+    except Exception as e:
+        _TRACKING_FAILURES += 1
+        print(f"Error tracking enrichment: {e}", file=sys.stderr)
 
-    target_file = sys.argv[1]
-    entry_key = sys.argv[2]
 
-    # Verify target file exists
-    if not Path(target_file).exists():
-        print(f"Error: Target file '{target_file}' not found", file=sys.stderr)
-        sys.exit(1)
+def enrich_and_track(
+    target_file: str, entry_key: str, entry_content: str | None
+) -> int:
+    """Run enrich_entry, failing the entry if its result could not be tracked."""
+    failures = _TRACKING_FAILURES
+    code = enrich_entry(target_file, entry_key, entry_content)
+    if _TRACKING_FAILURES != failures:
+        print(f"{TRACKING_FAILED_PREFIX} {entry_key}")
+        return 1
+    return code
 
-    # Extract the entry
-    print(f"Extracting entry '{entry_key}' from {target_file}")
-    entry_content = extract_entry_by_key(target_file, entry_key)
 
+def enrich_entry(target_file: str, entry_key: str, entry_content: str | None) -> int:
+    """Enrich one extracted entry, track the result and return its exit code."""
     if not entry_content:
         print(f"Error: Entry '{entry_key}' not found in {target_file}", file=sys.stderr)
         track_enrichment(target_file, entry_key, False, error_msg="Entry not found")
-        sys.exit(1)
+        return 1
 
     # Create temporary file for enrichment
     with tempfile.NamedTemporaryFile(
@@ -132,8 +207,7 @@ def main() -> None:
             enriched_content = f.read()
 
         # Check if enriched
-        is_enriched = check_enrichment(enriched_content)
-        openalex_id = extract_openalex_id(enriched_content) if is_enriched else None
+        is_enriched, openalex_id = scan_enrichment(enriched_content)
 
         # Track the result
         if is_enriched:
@@ -145,23 +219,85 @@ def main() -> None:
             with open(result_path, "w", encoding="utf-8") as f:
                 f.write(enriched_content)
             print(f"Enriched entry saved to: {result_path}")
-            sys.exit(0)
+            return 0
         else:
             print("Entry processed but no enrichment indicators found")
             track_enrichment(
                 target_file, entry_key, False, error_msg="No enrichment indicators"
             )
-            sys.exit(2)
+            return 2
 
     except Exception as e:
         print(f"Error during enrichment: {e}", file=sys.stderr)
         track_enrichment(target_file, entry_key, False, error_msg=str(e))
-        sys.exit(1)
+        return 1
     finally:
         # Clean up temporary file
         if Path(tmp_path).exists():
             Path(tmp_path).unlink()
 
 
+def enrich_entries(target_file: str, entry_keys: Iterable[str]) -> int:
+    """Enrich entries one after another, indexing the target file only once."""
+    spans = block_spans(target_file)
+
+    worst = 0
+    for entry_key in entry_keys:
+        # Keep each entry's errors inside its own section of the output.
+        with contextlib.redirect_stderr(sys.stdout):
+            print(f"Extracting entry '{entry_key}' from {target_file}")
+            entry_content = extract_entry_by_key(target_file, entry_key, spans)
+            code = enrich_and_track(target_file, entry_key, entry_content)
+        print(f"{STATUS_PREFIX} {entry_key} {code}", flush=True)
+        if code == 1 or worst == 0:
+            worst = code
+    return worst
+
+
+def main() -> None:
+    if len(sys.argv) < 3:
+        print(
+            "Usage: enrich-single-entry.py <target_file> <entry_key> [entry_key ...]",
+            file=sys.stderr,
+        )
+        print(
+            "       enrich-single-entry.py <target_file> --stdin", file=sys.stderr
+        )
+        print(
+            "\nThis script enriches a single entry and tracks the result.",
+            file=sys.stderr,
+        )
+        print("Designed to be called from Claude Code environment.", file=sys.stderr)
+        sys.exit(1)
+
+    target_file = sys.argv[1]
+    entry_keys = sys.argv[2:]
+
+    # Verify target file exists
+    if not Path(target_file).exists():
+        print(f"Error: Target file '{target_file}' not found", file=sys.stderr)
+        sys.exit(1)
+
+    if entry_keys == ["--stdin"] or len(entry_keys) > 1:
+        try:
+            if entry_keys == ["--stdin"]:
+                keys = (line.strip() for line in sys.stdin)
+                code = enrich_entries(target_file, (key for key in keys if key))
+            else:
+                code = enrich_entries(target_file, entry_keys)
+        finally:
+            close_tracker()
+        sys.exit(code)
+
+    # Extract the entry
+    print(f"Extracting entry '{entry_keys[0]}' from {target_file}")
+    entry_content = extract_entry_by_key(target_file, entry_keys[0])
+    try:
+        code = enrich_and_track(target_file, entry_keys[0], entry_content)
+    finally:
+        close_tracker()
+    sys.exit(code)
+
+
 if __name__ == "__main__":
     main()
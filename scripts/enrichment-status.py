@@ -13,6 +13,14 @@ import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# Same index as init-tracking-db.py; older databases get it on first use.
+# (file_path, entry_key) lookups are already served by idx_entry_lookup and
+# idx_latest_status_lookup.
+_SQL_CREATE_RECENT_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_log_recent
+    ON enrichment_log(timestamp, status)
+"""
+
 
 def get_file_stats(
     cursor: sqlite3.Cursor, file_path: str | None = None
@@ -72,6 +80,9 @@ def get_recent_activity(cursor: sqlite3.Cursor, days: int = 30) -> list[sqlite3.
     """Get recent enrichment activity."""
     cutoff_date = datetime.now() - timedelta(days=days)
 
+    # The bare date bound lets idx_log_recent narrow the scan: ISO timestamps
+    # from the cutoff day on sort at or after it whether stored with " " or
+    # "T". The datetime() comparison then applies the exact cutoff.
     cursor.execute(
         """
         SELECT 
@@ -80,12 +91,12 @@ def get_recent_activity(cursor: sqlite3.Cursor, days: int = 30) -> list[sqlite3.
             COUNT(CASE WHEN status = 'success' THEN 1 END) as successes,
             COUNT(CASE WHEN status = 'failed' THEN 1 END) as failures
         FROM enrichment_log
-        WHERE datetime(timestamp) > datetime(?)
+        WHERE timestamp >= ? AND datetime(timestamp) > datetime(?)
         GROUP BY DATE(timestamp)
         ORDER BY date DESC
         LIMIT 10
     """,
-        (cutoff_date.isoformat(),),
+        (cutoff_date.date().isoformat(), cutoff_date.isoformat()),
     )
 
     return cursor.fetchall()
@@ -123,6 +134,12 @@ def main() -> None:
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
+    try:
+        with conn:
+            conn.execute(_SQL_CREATE_RECENT_INDEX)
+    except sqlite3.OperationalError:
+        pass  # Read-only or locked database: queries still work, just unindexed
+
     try:
         if args.recent:
             activity = get_recent_activity(cursor)
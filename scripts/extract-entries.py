@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 """
 Extract BibTeX entries from a file and write them as individual files.
-Creates entry-N.bib files in specified output directory or tmp/<basename>/ by default.
+Creates entry-N.bib files in specified output directory or tmp/<basename>/ by default,
+plus an index.json sidecar mapping each entry number to its citation key.
 """
 
+import json
+import re
 import shutil
 import sys
 from pathlib import Path
 
+INDEX_FILENAME = "index.json"
+ENTRY_KEY_RE = re.compile(r"@\w+\{([^,\s]+)")
+
 
 def find_entry_end(lines: list[str], start_idx: int) -> int:
     """Find the end line of a BibTeX entry by tracking brace depth."""
@@ -50,6 +56,7 @@ def should_skip_entry(entry_type: str) -> bool:
 def extract_and_write_entries(filepath: str | Path, output_dir: Path) -> int:
     """Extract all BibTeX entries and write them as individual files."""
     entries_written = 0
+    index: dict[int, str | None] = {}
 
     try:
         with open(filepath, "r", encoding="utf-8") as f:
@@ -89,6 +96,9 @@ def extract_and_write_entries(filepath: str | Path, output_dir: Path) -> int:
                 with open(entry_file, "w", encoding="utf-8") as f:
                     f.write(entry_text)
 
+                match = ENTRY_KEY_RE.match(entry_text.strip())
+                index[entry_num] = match.group(1) if match else None
+
                 entries_written += 1
                 entry_num += 1
                 i = end_idx + 1
@@ -99,6 +109,9 @@ def extract_and_write_entries(filepath: str | Path, output_dir: Path) -> int:
         else:
             i += 1
 
+    with open(output_dir / INDEX_FILENAME, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+
     return entries_written
 
 
@@ -9,7 +9,10 @@ import sys
 
 
 def init_database(db_path: str = "bibliography.db") -> None:
-    """Initialize the enrichment tracking database with atomic transaction."""
+    """Initialize the enrichment tracking database with atomic transaction.
+
+    Raises after rolling back if any part of the schema cannot be created.
+    """
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
@@ -38,6 +41,18 @@ def init_database(db_path: str = "bibliography.db") -> None:
             ON enrichment_log(file_path, entry_key)
         """)
 
+        # Covering index for per-file latest-status lookups on the base table
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_latest_status_lookup
+            ON enrichment_log(file_path, entry_key, timestamp, status)
+        """)
+
+        # Date-range activity reports (enrichment-status.py --recent)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_log_recent
+            ON enrichment_log(timestamp, status)
+        """)
+
         # Create a view for latest status per entry
         cursor.execute("""
             CREATE VIEW IF NOT EXISTS latest_enrichment_status AS
@@ -71,18 +86,21 @@ def init_database(db_path: str = "bibliography.db") -> None:
 
         # Commit only if all schema creation succeeded
         conn.commit()
-        print(f"✓ Initialized tracking database: {db_path}")
 
-    except Exception as e:
+    except Exception:
         # Rollback transaction on any error
         conn.rollback()
-        print(f"✗ Error initializing database: {e}", file=sys.stderr)
-        print("✗ Transaction rolled back - database unchanged", file=sys.stderr)
-        sys.exit(1)
+        raise
     finally:
         conn.close()
 
 
 if __name__ == "__main__":
     db_path = sys.argv[1] if len(sys.argv) > 1 else "bibliography.db"
-    init_database(db_path)
+    try:
+        init_database(db_path)
+    except Exception as e:
+        print(f"✗ Error initializing database: {e}", file=sys.stderr)
+        print("✗ Transaction rolled back - database unchanged", file=sys.stderr)
+        sys.exit(1)
+    print(f"✓ Initialized tracking database: {db_path}")
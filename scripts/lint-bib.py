@@ -13,7 +13,7 @@ from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
 
-from core.bibtex_io import parse_bib_file
+from core.bibtex_io import parse_bib_text
 
 HTTP_URL_RE = re.compile(r"^https?://", re.IGNORECASE)
 OPENREVIEW_FORUM_RE = re.compile(r"https?://openreview\.net/forum\?id=([^&#]+)", re.IGNORECASE)
@@ -32,7 +32,7 @@ REQUIRED_FIELDS_BY_TYPE: dict[str, tuple[str, ...]] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Issue:
     file: str
     key: str | None
@@ -82,7 +82,7 @@ def iter_bib_files(patterns: list[str]) -> list[Path]:
             if p.exists():
                 matches = [p]
         for p in matches:
-            if p.is_file() and p.suffix.lower() == ".bib":
+            if p.suffix.lower() == ".bib" and p.is_file():
                 rp = p.resolve()
                 if rp not in seen:
                     seen.add(rp)
@@ -90,8 +90,8 @@ def iter_bib_files(patterns: list[str]) -> list[Path]:
     return found
 
 
-def parse_bib(path: Path) -> Any:
-    return parse_bib_file(path)
+def parse_bib(text: str) -> Any:
+    return parse_bib_text(text)
 
 
 def normalize_spaces(s: str) -> str:
@@ -313,13 +313,10 @@ def lint_entry(path: Path, entry: dict[str, Any]) -> list[Issue]:
 
 def lint_file(path: Path) -> tuple[int, list[Issue]]:
     issues: list[Issue] = []
-    raw_text = ""
+    # The raw text feeds both the parser and the empty-parse heuristic below
     try:
         raw_text = path.read_text(encoding="utf-8")
-    except Exception:
-        raw_text = ""
-    try:
-        db = parse_bib(path)
+        db = parse_bib(raw_text)
     except Exception as ex:
         return 0, [
             Issue(
@@ -67,7 +67,7 @@ def iter_bib_files(patterns: list[str], only_orals: bool) -> list[Path]:
             if p.exists():
                 matches = [p]
         for p in matches:
-            if p.is_file() and p.suffix.lower() == ".bib":
+            if p.suffix.lower() == ".bib" and p.is_file():
                 if only_orals and p.parts[:2] != ("collections", "orals"):
                     continue
                 rp = p.resolve()
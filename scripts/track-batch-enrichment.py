@@ -11,6 +11,8 @@ import subprocess
 import sys
 from pathlib import Path
 
+from core.enrichment_scan import scan_enrichment
+
 
 def extract_entry_key(content: str) -> str | None:
     """Extract entry key from BibTeX content."""
@@ -18,19 +20,6 @@ def extract_entry_key(content: str) -> str | None:
     return match.group(1) if match else None
 
 
-def extract_openalex_id(content: str) -> str | None:
-    """Extract OpenAlex ID from BibTeX content."""
-    match = re.search(r"openalex\s*=\s*\{([^}]+)\}", content, re.IGNORECASE)
-    return match.group(1) if match else None
-
-
-def check_enrichment(content: str) -> bool:
-    """Check if entry has enrichment indicators."""
-    indicators = ["openalex", "pdf", "abstract"]
-    content_lower = content.lower()
-    return any(indicator in content_lower for indicator in indicators)
-
-
 def track_entry(
     file_path: str, entry_key: str, success: bool, openalex_id: str | None = None
 ) -> bool:
@@ -92,8 +81,7 @@ def main() -> None:
                 continue
 
             # Check if enriched
-            is_enriched = check_enrichment(content)
-            openalex_id = extract_openalex_id(content) if is_enriched else None
+            is_enriched, openalex_id = scan_enrichment(content)
 
             # Track the result
             if track_entry(str(bib_file), entry_key, is_enriched, openalex_id):
@@ -11,66 +11,109 @@ import sys
 from pathlib import Path
 
 
-def log_enrichment(
-    file_path: str,
-    entry_key: str,
-    status: str,
-    openalex_id: str | None = None,
-    error_msg: str | None = None,
-) -> None:
-    """Log an enrichment attempt to the database with atomic transaction."""
+_SQL_INSERT = """
+    INSERT INTO enrichment_log
+        (file_path, entry_key, status, openalex_id, error_message)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def should_track(file_path: str) -> bool:
+    """Return False (with a notice) for files that are not tracked."""
     # Skip temporary files outside the repository
     path_obj = Path(file_path)
     if path_obj.is_absolute() and not path_obj.is_relative_to(Path.cwd()):
         print(f"⚠ Skipping tracking for external file: {file_path}")
-        return
+        return False
 
     # Skip files in tmp/ directory
     if str(path_obj).startswith("tmp/") or "/tmp/" in str(path_obj):
         print(f"⚠ Skipping tracking for temporary file: {file_path}")
-        return
+        return False
+
+    return True
+
+
+class EnrichmentTracker:
+    """Write enrichment results over one connection, one transaction per result.
+
+    Each result is committed before record() returns, so a caller may report
+    the entry as tracked as soon as it does.
+    """
+
+    def __init__(self, db_path: str = "bibliography.db"):
+        self.db_path = db_path
+        self._conn: sqlite3.Connection | None = None
+
+    def __enter__(self) -> "EnrichmentTracker":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def record(
+        self,
+        file_path: str,
+        entry_key: str,
+        status: str,
+        openalex_id: str | None = None,
+        error_msg: str | None = None,
+    ) -> None:
+        """Insert one result; on error the transaction is rolled back and re-raised."""
+        if not should_track(file_path):
+            return
+
+        # with-block commits, or rolls back if the insert raises
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    _SQL_INSERT, (file_path, entry_key, status, openalex_id, error_msg)
+                )
+        except sqlite3.IntegrityError:
+            # Entry already logged for this timestamp (within same second)
+            print(f"⚠ Entry already logged recently: {entry_key}")
+            return
+        print(f"✓ Logged {status} for {entry_key} in {file_path}")
 
-    db_path = "bibliography.db"
+    def close(self) -> None:
+        """Close the connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
-    # Initialize DB if it doesn't exist
-    if not Path(db_path).exists():
-        import subprocess
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Initialize DB if it doesn't exist
+            if not Path(self.db_path).exists():
+                import subprocess
 
-        subprocess.run([sys.executable, "scripts/init-tracking-db.py", db_path])
+                subprocess.run(
+                    [sys.executable, "scripts/init-tracking-db.py", self.db_path]
+                )
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+            # WAL lets concurrent enrichment workers write without blocking readers
+            self._conn = sqlite3.connect(self.db_path, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        return self._conn
 
-    try:
-        # Start transaction explicitly
-        conn.execute("BEGIN TRANSACTION")
-
-        cursor.execute(
-            """
-            INSERT INTO enrichment_log
-                (file_path, entry_key, status, openalex_id, error_message)
-            VALUES (?, ?, ?, ?, ?)
-        """,
-            (file_path, entry_key, status, openalex_id, error_msg),
-        )
-
-        # Commit only if everything succeeded
-        conn.commit()
-        print(f"✓ Logged {status} for {entry_key} in {file_path}")
 
-    except sqlite3.IntegrityError:
-        # Rollback transaction
-        conn.rollback()
-        # Entry already logged for this timestamp (within same second)
-        print(f"⚠ Entry already logged recently: {entry_key}")
+def log_enrichment(
+    file_path: str,
+    entry_key: str,
+    status: str,
+    openalex_id: str | None = None,
+    error_msg: str | None = None,
+) -> None:
+    """Log an enrichment attempt to the database with atomic transaction."""
+    try:
+        with EnrichmentTracker() as tracker:
+            tracker.record(file_path, entry_key, status, openalex_id, error_msg)
     except Exception as e:
-        # Rollback transaction on any error
-        conn.rollback()
         print(f"✗ Error logging enrichment: {e}", file=sys.stderr)
         print("✗ Transaction rolled back - database unchanged", file=sys.stderr)
         sys.exit(1)
-    finally:
-        conn.close()
 
 
 def main() -> None:
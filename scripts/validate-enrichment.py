@@ -41,6 +41,19 @@ MANDATORY_FIELDS = {
     "inbook": ["author", "title", "pages", "publisher", "year"],
 }
 
+# Each mandatory field name maps to one bit so per-type requirements become
+# integer masks and the presence check is a single mask operation.
+_FIELD_BIT = {
+    field: 1 << index
+    for index, field in enumerate(
+        dict.fromkeys(f for fields in MANDATORY_FIELDS.values() for f in fields)
+    )
+}
+_MANDATORY_MASK = {
+    entry_type: sum(_FIELD_BIT[field] for field in fields)
+    for entry_type, fields in MANDATORY_FIELDS.items()
+}
+
 # Fields that should be present in enriched entries
 ENRICHMENT_FIELDS = ["openalex", "pdf", "abstract"]
 
@@ -91,13 +104,22 @@ class ValidationResult:
 def check_mandatory_fields(entry: dict[str, Any], result: ValidationResult) -> None:
     """Check if all mandatory fields are present."""
     entry_type = entry.get("ENTRYTYPE", "").lower()
-    mandatory = MANDATORY_FIELDS.get(entry_type, [])
+    required_mask = _MANDATORY_MASK.get(entry_type, 0)
+    if not required_mask:
+        return
 
-    for field in mandatory:
-        if field in entry and entry[field].strip():
-            result.passed.append(f"Mandatory field '{field}' present")
-        else:
+    present_mask = 0
+    for field, value in entry.items():
+        bit = _FIELD_BIT.get(field, 0)
+        if bit & required_mask and value.strip():
+            present_mask |= bit
+    missing_mask = required_mask & ~present_mask
+
+    for field in MANDATORY_FIELDS[entry_type]:
+        if missing_mask & _FIELD_BIT[field]:
             result.failed.append(f"Missing mandatory field '{field}'")
+        else:
+            result.passed.append(f"Mandatory field '{field}' present")
 
 
 def check_openalex_id(entry: dict[str, Any], result: ValidationResult) -> None:
@@ -362,7 +384,7 @@ def update_tracking_database(
         conn.close()
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         description="Validate enriched BibTeX entries for quality and completeness"
     )
@@ -378,20 +400,20 @@ def main() -> None:
         "--summary", action="store_true", help="Show only summary statistics"
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Check file exists
     file_path = Path(args.file)
     if not file_path.exists():
         print(f"Error: File {file_path} does not exist", file=sys.stderr)
-        sys.exit(1)
+        return 1
 
     # Parse BibTeX file
     try:
         bib_db = parse_bib_file(file_path)
     except Exception as e:
         print(f"Error parsing BibTeX file: {e}", file=sys.stderr)
-        sys.exit(1)
+        return 1
 
     # Filter entries if specific key requested
     if args.entry_key:
@@ -401,7 +423,7 @@ def main() -> None:
                 f"Error: Entry '{args.entry_key}' not found in {file_path}",
                 file=sys.stderr,
             )
-            sys.exit(1)
+            return 1
     else:
         entries = bib_db.entries
 
@@ -449,9 +471,8 @@ def main() -> None:
         update_tracking_database(str(file_path), results)
 
     # Exit with error if any failures
-    if failed > 0:
-        sys.exit(1)
+    return 1 if failed > 0 else 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
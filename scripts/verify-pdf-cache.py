@@ -6,6 +6,7 @@ from __future__ import annotations
 import argparse
 import glob
 import json
+import os
 import re
 import sys
 import unicodedata
@@ -19,7 +20,7 @@ from core.bibtex_io import parse_bib_file
 PDF_HEADER = b"%PDF-"
 
 
-@dataclass
+@dataclass(slots=True)
 class Issue:
     file: str
     key: str | None
@@ -61,7 +62,7 @@ def iter_bib_files(patterns: list[str]) -> list[Path]:
             if p.exists():
                 matches = [p]
         for p in matches:
-            if p.is_file() and p.suffix.lower() == ".bib":
+            if p.suffix.lower() == ".bib" and p.is_file():
                 rp = p.resolve()
                 if rp not in seen:
                     seen.add(rp)
@@ -94,9 +95,12 @@ def extract_paths_from_file_field(raw: str) -> list[Path]:
     if not raw:
         return []
 
-    paths: list[Path] = []
-    for chunk in [c.strip() for c in raw.split(";") if c.strip()]:
-        item = chunk
+    # Work on plain strings until the final Path construction.
+    items: list[str] = []
+    for chunk in raw.split(";"):
+        item = chunk.strip()
+        if not item:
+            continue
         if item.startswith(":"):
             item = item[1:]
 
@@ -104,23 +108,18 @@ def extract_paths_from_file_field(raw: str) -> list[Path]:
         lowered = item.lower()
         if lowered.endswith(":pdf"):
             item = item[:-4]
+            lowered = lowered[:-4]
         elif ":" in item:
             head, tail = item.rsplit(":", 1)
             if tail.lower() in {"pdf", "application/pdf"}:
                 item = head
+                lowered = head.lower()
 
-        if item.lower().endswith(".pdf"):
-            paths.append(Path(item))
+        if lowered.endswith(".pdf"):
+            items.append(item)
 
     # Deduplicate while preserving order.
-    out: list[Path] = []
-    seen: set[str] = set()
-    for p in paths:
-        key = str(p)
-        if key not in seen:
-            seen.add(key)
-            out.append(p)
-    return out
+    return list(dict.fromkeys(Path(item) for item in items))
 
 
 def read_pdf_metadata_title(path: Path) -> str:
@@ -164,11 +163,25 @@ def metadata_title_plausible(title: str) -> bool:
     return True
 
 
+def list_directory(directory: Path, cache: dict[Path, dict[str, os.DirEntry[str]]]) -> dict[str, os.DirEntry[str]]:
+    """Return a cached name -> DirEntry map so entries sharing a directory cost one scan."""
+    listing = cache.get(directory)
+    if listing is None:
+        try:
+            with os.scandir(directory) as it:
+                listing = {item.name: item for item in it}
+        except OSError:
+            listing = {}
+        cache[directory] = listing
+    return listing
+
+
 def verify_pdf_attachment(
     bib_path: Path,
     entry: dict[str, Any],
     attachment: Path,
     strict_title_match: bool,
+    dir_cache: dict[Path, dict[str, os.DirEntry[str]]] | None = None,
 ) -> list[Issue]:
     issues: list[Issue] = []
     key = str(entry.get("ID", "")).strip() or None
@@ -177,7 +190,8 @@ def verify_pdf_attachment(
     if not attachment.is_absolute():
         attachment = (bib_path.parent / attachment).resolve()
 
-    if not attachment.exists():
+    dir_entry = list_directory(attachment.parent, {} if dir_cache is None else dir_cache).get(attachment.name)
+    if dir_entry is None or not (dir_entry.is_file() or attachment.exists()):
         return [
             Issue(
                 file=str(bib_path),
@@ -188,7 +202,7 @@ def verify_pdf_attachment(
             )
         ]
 
-    if not attachment.is_file():
+    if not dir_entry.is_file():
         return [
             Issue(
                 file=str(bib_path),
@@ -199,7 +213,7 @@ def verify_pdf_attachment(
             )
         ]
 
-    size = attachment.stat().st_size
+    size = dir_entry.stat().st_size
     if size < 1024:
         issues.append(
             Issue(
@@ -292,6 +306,7 @@ def verify_file(path: Path, strict_title_match: bool) -> tuple[int, list[Issue]]
         ]
 
     entries = list(db.entries)
+    dir_cache: dict[Path, dict[str, os.DirEntry[str]]] = {}
     for entry in entries:
         key = str(entry.get("ID", "")).strip() or None
         raw_file = str(entry.get("file", "")).strip()
@@ -321,7 +336,7 @@ def verify_file(path: Path, strict_title_match: bool) -> tuple[int, list[Issue]]
             continue
 
         for attachment in attachments:
-            issues.extend(verify_pdf_attachment(path, entry, attachment, strict_title_match))
+            issues.extend(verify_pdf_attachment(path, entry, attachment, strict_title_match, dir_cache))
 
     return len(entries), issues
 
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import core.bibtex_io as bibtex_io  # noqa: E402
+from core.bibtex_io import (  # noqa: E402
+    build_raw_block_index,
+    count_raw_entries,
+    find_raw_entry,
+    iter_raw_blocks,
+    parse_bib_entries,
+    parse_bib_text,
+    raw_block_index,
+)
+
+SAMPLE = """@comment{note}
+
+@article{example2024flow,
+  author = {Example, Ada},
+  title = {Example},
+  year = {2024}
+}
+"""
+
+
+class ParseBibEntriesTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self.tmpdir.name)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_entries_from_path_match_text_parse(self) -> None:
+        path = self.tmp_path / "sample.bib"
+        path.write_text(SAMPLE, encoding="utf-8")
+        self.assertEqual(parse_bib_entries(path), parse_bib_text(SAMPLE).entries)
+
+
+class RawBlockTests(unittest.TestCase):
+    def test_blocks_are_spanned_verbatim(self) -> None:
+        blocks = list(iter_raw_blocks(SAMPLE))
+        self.assertEqual([kind for kind, _, _ in blocks], ["comment", "article"])
+        _, start, end = blocks[1]
+        self.assertTrue(SAMPLE[start:end].startswith("@article{example2024flow,"))
+        self.assertTrue(SAMPLE[start:end].endswith("}"))
+
+    def test_at_lines_inside_values_and_escaped_braces(self) -> None:
+        text = "@Article{a,\n  abstract = {x \\{ y\n@book mentioned}\n}\n@string\n{s = {z}}\n"
+        self.assertEqual([kind for kind, _, _ in iter_raw_blocks(text)], ["article", "string"])
+
+    def test_count_skips_non_entry_blocks(self) -> None:
+        text = SAMPLE + "@string{s = {z}}\n@preamble{{x}}\n@misc{m,}\n"
+        self.assertEqual(count_raw_entries(text), len(parse_bib_text(SAMPLE).entries) + 1)
+
+    def test_malformed_text_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            list(iter_raw_blocks("mail me@example.org\n@article{a, title={b}}\n"))
+        with self.assertRaises(ValueError):
+            list(iter_raw_blocks("@article{a, title={b}\n"))
+
+
+class RawBlockIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_spans_are_byte_offsets(self) -> None:
+        data = ("@misc{m\u00fcller2024, title = {\u00c9t\u00e9}}\n" + SAMPLE).encode("utf-8")
+        index = build_raw_block_index(data)
+        self.assertEqual(index.entry_count, 2)
+        start, end = index.spans["example2024flow"]
+        self.assertTrue(data[start:end].startswith(b"@article{example2024flow,"))
+        start, end = index.spans["m\u00fcller2024"]
+        self.assertEqual(data[start:end].decode("utf-8"), "@misc{m\u00fcller2024, title = {\u00c9t\u00e9}}")
+
+    def test_cached_until_file_changes(self) -> None:
+        path = self.root / "sample.bib"
+        cache_dir = self.root / "cache"
+        path.write_text(SAMPLE, encoding="utf-8")
+        self.assertEqual(raw_block_index(path, cache_dir=cache_dir).entry_count, 1)
+        self.assertEqual(raw_block_index(path, cache_dir=cache_dir).entry_count, 1)
+        self.assertEqual(len(list(cache_dir.glob("*.pkl"))), 1)
+
+        path.write_text(SAMPLE + "@misc{m,}\n", encoding="utf-8")
+        self.assertEqual(raw_block_index(path, cache_dir=cache_dir).entry_count, 2)
+        self.assertEqual(len(list(cache_dir.glob("*.pkl"))), 2)
+
+    def test_cache_evicts_least_recently_used(self) -> None:
+        cache_dir = self.root / "cache"
+        paths = {name: self.root / f"{name}.bib" for name in ("a", "b", "c")}
+        for path in paths.values():
+            path.write_text(SAMPLE, encoding="utf-8")
+        with mock.patch.object(bibtex_io, "BLOCK_INDEX_CACHE_LIMIT", 2):
+            raw_block_index(paths["a"], cache_dir=cache_dir)
+            cached_a = set(cache_dir.glob("*.pkl"))
+            raw_block_index(paths["b"], cache_dir=cache_dir)
+            cached_b = set(cache_dir.glob("*.pkl")) - cached_a
+            for cache_path in cache_dir.glob("*.pkl"):
+                os.utime(cache_path, ns=(1, 1))
+
+            # Reading "a" again leaves "b" as the least recently used
+            raw_block_index(paths["a"], cache_dir=cache_dir)
+            raw_block_index(paths["c"], cache_dir=cache_dir)
+
+        remaining = set(cache_dir.glob("*.pkl"))
+        self.assertEqual(len(remaining), 2)
+        self.assertTrue(cached_a <= remaining)
+        self.assertFalse(cached_b & remaining)
+
+
+class FindRawEntryTests(unittest.TestCase):
+    def test_finds_only_the_requested_key(self) -> None:
+        data = (SAMPLE + "@misc{example2024flowx, note = {a}}\n").encode("utf-8")
+        start, end = find_raw_entry(data, "example2024flow")
+        self.assertTrue(data[start:end].startswith(b"@article{example2024flow,"))
+        self.assertTrue(data[start:end].endswith(b"}"))
+        start, end = find_raw_entry(data, "example2024flowx")
+        self.assertEqual(data[start:end], b"@misc{example2024flowx, note = {a}}")
+
+    def test_missing_or_unbalanced_entry_returns_none(self) -> None:
+        self.assertIsNone(find_raw_entry(SAMPLE.encode("utf-8"), "absent2024"))
+        self.assertIsNone(find_raw_entry(b"@article{a, title={b}\n", "a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from core.enrichment_scan import scan_enrichment, scan_enrichment_file  # noqa: E402
+
+ENRICHED = """@article{example2024flow,
+  title = {Example},
+  pdf = {https://example.org/paper.pdf},
+  openalex = {W1234567890}
+}
+"""
+
+
+class ScanEnrichmentTests(unittest.TestCase):
+    def test_text_and_bytes_agree(self) -> None:
+        self.assertEqual(scan_enrichment(ENRICHED), (True, "W1234567890"))
+        self.assertEqual(scan_enrichment(ENRICHED.encode("utf-8")), (True, "W1234567890"))
+
+    def test_indicator_without_openalex_id(self) -> None:
+        self.assertEqual(scan_enrichment("@misc{m, abstract = {A}}"), (True, None))
+        self.assertEqual(scan_enrichment("@misc{m, title = {A}}"), (False, None))
+
+    def test_scan_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "entry.bib"
+            path.write_text(ENRICHED, encoding="utf-8")
+            self.assertEqual(scan_enrichment_file(str(path)), (True, "W1234567890"))
+
+            path.write_text("", encoding="utf-8")
+            self.assertEqual(scan_enrichment_file(str(path)), (False, None))
+
+
+if __name__ == "__main__":
+    unittest.main()